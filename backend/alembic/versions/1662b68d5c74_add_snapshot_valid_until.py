@@ -0,0 +1,31 @@
+"""add_snapshot_valid_until
+
+Revision ID: 1662b68d5c74
+Revises: 9b62b05092d8
+Create Date: 2026-10-17 17:18:03.357478
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1662b68d5c74'
+down_revision: Union[str, Sequence[str], None] = '9b62b05092d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add valid_until so unchanged readings can extend the previous snapshot."""
+    op.add_column(
+        'parking_snapshots',
+        sa.Column('valid_until', sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Remove valid_until from parking_snapshots."""
+    op.drop_column('parking_snapshots', 'valid_until')
@@ -0,0 +1,154 @@
+"""partition_parking_snapshots
+
+Revision ID: 2a7a735cc076
+Revises: 1662b68d5c74
+Create Date: 2026-10-17 17:20:41.118406
+
+Converts parking_snapshots into a table range-partitioned by collected_at with
+one child per UTC month (parking_snapshots_pYYYY_MM) plus a default partition.
+Partitions are created from the oldest snapshot's month through MONTHS_AHEAD
+months from now, or the newest snapshot's month if that is later, so no
+existing row starts out in the default partition; later months are created
+ahead of time by `python -m app.scripts.manage_partitions` and the collector
+daemon, which move any rows the default partition holds for them.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2a7a735cc076'
+down_revision: Union[str, Sequence[str], None] = '1662b68d5c74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Copy snapshots into a monthly range-partitioned parking_snapshots."""
+    op.execute("ALTER TABLE parking_snapshots RENAME TO parking_snapshots_old")
+    op.execute("ALTER INDEX idx_snapshots_lot_time RENAME TO idx_snapshots_lot_time_old")
+    op.execute(
+        "ALTER TABLE parking_snapshots_old "
+        "RENAME CONSTRAINT parking_snapshots_pkey TO parking_snapshots_old_pkey"
+    )
+    op.execute(
+        "ALTER TABLE parking_snapshots_old "
+        "RENAME CONSTRAINT parking_snapshots_lot_id_fkey TO parking_snapshots_old_lot_id_fkey"
+    )
+
+    # The partition key must be part of the primary key
+    op.execute(
+        """
+        CREATE TABLE parking_snapshots (
+            lot_id UUID NOT NULL,
+            free_spaces INTEGER NOT NULL,
+            occupancy_pct NUMERIC(5, 2),
+            collected_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            id UUID DEFAULT gen_random_uuid() NOT NULL,
+            valid_until TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT parking_snapshots_pkey PRIMARY KEY (id, collected_at),
+            CONSTRAINT parking_snapshots_lot_id_fkey
+                FOREIGN KEY (lot_id) REFERENCES parking_lots (id)
+        ) PARTITION BY RANGE (collected_at)
+        """
+    )
+    op.create_index(
+        'idx_snapshots_lot_time',
+        'parking_snapshots',
+        ['lot_id', sa.text('collected_at DESC')],
+        unique=False,
+    )
+
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            -- Month starts as UTC wall-clock times, so stepping a month
+            -- doesn't depend on the session's TimeZone
+            month timestamp;
+            last_month timestamp := greatest(
+                date_trunc('month', now() AT TIME ZONE 'UTC')
+                    + interval '{MONTHS_AHEAD} months',
+                date_trunc(
+                    'month',
+                    (SELECT max(collected_at) FROM parking_snapshots_old) AT TIME ZONE 'UTC'
+                )
+            );
+        BEGIN
+            month := date_trunc(
+                'month',
+                coalesce((SELECT min(collected_at) FROM parking_snapshots_old), now())
+                    AT TIME ZONE 'UTC'
+            );
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF parking_snapshots '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'parking_snapshots_p' || to_char(month, 'YYYY_MM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute("CREATE TABLE parking_snapshots_default PARTITION OF parking_snapshots DEFAULT")
+
+    op.execute(
+        "INSERT INTO parking_snapshots "
+        "(id, lot_id, free_spaces, occupancy_pct, collected_at, valid_until) "
+        "SELECT id, lot_id, free_spaces, occupancy_pct, collected_at, valid_until "
+        "FROM parking_snapshots_old"
+    )
+    op.drop_table('parking_snapshots_old')
+
+
+def downgrade() -> None:
+    """Copy snapshots back into a single unpartitioned table."""
+    op.execute("ALTER TABLE parking_snapshots RENAME TO parking_snapshots_partitioned")
+    op.execute(
+        "ALTER INDEX idx_snapshots_lot_time RENAME TO idx_snapshots_lot_time_partitioned"
+    )
+    op.execute(
+        "ALTER TABLE parking_snapshots_partitioned "
+        "RENAME CONSTRAINT parking_snapshots_pkey TO parking_snapshots_partitioned_pkey"
+    )
+    # Partitions carry their own copy of the foreign key; drop it everywhere so
+    # the recreated table gets the original constraint name.
+    op.execute(
+        "ALTER TABLE parking_snapshots_partitioned "
+        "DROP CONSTRAINT parking_snapshots_lot_id_fkey"
+    )
+
+    op.create_table('parking_snapshots',
+    sa.Column('lot_id', sa.UUID(), nullable=False),
+    sa.Column('free_spaces', sa.Integer(), nullable=False),
+    sa.Column('occupancy_pct', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('collected_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('valid_until', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['lot_id'], ['parking_lots.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_snapshots_lot_time',
+        'parking_snapshots',
+        ['lot_id', sa.text('collected_at DESC')],
+        unique=False,
+    )
+
+    op.execute(
+        "INSERT INTO parking_snapshots "
+        "(id, lot_id, free_spaces, occupancy_pct, collected_at, valid_until) "
+        "SELECT id, lot_id, free_spaces, occupancy_pct, collected_at, valid_until "
+        "FROM parking_snapshots_partitioned"
+    )
+    # Dropping the parent drops every attached partition with it
+    op.drop_table('parking_snapshots_partitioned')
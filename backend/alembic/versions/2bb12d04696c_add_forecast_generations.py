@@ -0,0 +1,65 @@
+"""add_forecast_generations
+
+Revision ID: 2bb12d04696c
+Revises: 765eed0ba73e
+Create Date: 2026-10-17 17:35:57.601192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2bb12d04696c'
+down_revision: Union[str, Sequence[str], None] = '765eed0ba73e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create forecast_generations and move existing forecasts into an active one."""
+    op.create_table('forecast_generations',
+    sa.Column('model_version', sa.String(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('activated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('lot_count', sa.Integer(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_forecast_generations_activated_at', 'forecast_generations', ['activated_at'], unique=False)
+
+    op.add_column('parking_forecasts', sa.Column('generation_id', sa.UUID(), nullable=True))
+    op.execute(
+        "INSERT INTO forecast_generations "
+        "(model_version, generated_at, activated_at, lot_count, row_count) "
+        "SELECT min(model_version), max(generated_at), now(), count(DISTINCT lot_id), count(*) "
+        "FROM parking_forecasts HAVING count(*) > 0"
+    )
+    op.execute(
+        "UPDATE parking_forecasts SET generation_id = (SELECT id FROM forecast_generations)"
+    )
+    op.alter_column('parking_forecasts', 'generation_id', nullable=False)
+    op.create_foreign_key(
+        'parking_forecasts_generation_id_fkey', 'parking_forecasts',
+        'forecast_generations', ['generation_id'], ['id'],
+    )
+    op.drop_index('idx_forecasts_lot_time', table_name='parking_forecasts')
+    op.create_index('idx_forecasts_generation_lot_time', 'parking_forecasts', ['generation_id', 'lot_id', 'forecast_time'], unique=False)
+
+
+def downgrade() -> None:
+    """Keep only the active generation's forecasts and drop forecast_generations."""
+    op.execute(
+        "DELETE FROM parking_forecasts WHERE generation_id IS DISTINCT FROM ("
+        "SELECT id FROM forecast_generations WHERE activated_at IS NOT NULL "
+        "ORDER BY activated_at DESC LIMIT 1)"
+    )
+    op.drop_index('idx_forecasts_generation_lot_time', table_name='parking_forecasts')
+    op.create_index('idx_forecasts_lot_time', 'parking_forecasts', ['lot_id', 'forecast_time'], unique=False)
+    op.drop_constraint('parking_forecasts_generation_id_fkey', 'parking_forecasts', type_='foreignkey')
+    op.drop_column('parking_forecasts', 'generation_id')
+    op.drop_index('idx_forecast_generations_activated_at', table_name='forecast_generations')
+    op.drop_table('forecast_generations')
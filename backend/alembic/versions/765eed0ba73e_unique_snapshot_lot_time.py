@@ -0,0 +1,55 @@
+"""unique_snapshot_lot_time
+
+Revision ID: 765eed0ba73e
+Revises: cf6e67baa7e8
+Create Date: 2026-10-17 17:33:12.104412
+
+Makes idx_snapshots_lot_time unique so the collector can replay spooled
+readings with ON CONFLICT (lot_id, collected_at) DO NOTHING. Duplicate
+readings already stored are collapsed to one row first.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '765eed0ba73e'
+down_revision: Union[str, Sequence[str], None] = 'cf6e67baa7e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop duplicate (lot_id, collected_at) snapshots and make the index unique."""
+    op.execute(
+        "DELETE FROM parking_snapshots a USING parking_snapshots b "
+        "WHERE a.lot_id = b.lot_id AND a.collected_at = b.collected_at AND a.id > b.id"
+    )
+    # Point latest availability at the surviving row
+    op.execute(
+        "UPDATE lot_latest_availability l SET snapshot_id = s.id "
+        "FROM parking_snapshots s "
+        "WHERE s.lot_id = l.lot_id AND s.collected_at = l.snapshot_collected_at "
+        "AND s.id <> l.snapshot_id"
+    )
+    op.drop_index('idx_snapshots_lot_time', table_name='parking_snapshots')
+    op.create_index(
+        'idx_snapshots_lot_time',
+        'parking_snapshots',
+        ['lot_id', sa.text('collected_at DESC')],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Make idx_snapshots_lot_time non-unique again."""
+    op.drop_index('idx_snapshots_lot_time', table_name='parking_snapshots')
+    op.create_index(
+        'idx_snapshots_lot_time',
+        'parking_snapshots',
+        ['lot_id', sa.text('collected_at DESC')],
+        unique=False,
+    )
@@ -0,0 +1,32 @@
+"""add_forecast_nowcast_columns
+
+Revision ID: 974cc3d2a990
+Revises: 2bb12d04696c
+Create Date: 2026-10-17 17:40:54.088387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '974cc3d2a990'
+down_revision: Union[str, Sequence[str], None] = '2bb12d04696c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add columns recording nowcast corrections of forecasts."""
+    op.add_column('parking_forecasts', sa.Column('baseline_free_spaces', sa.Integer(), nullable=True))
+    op.add_column('parking_forecasts', sa.Column('baseline_free_spaces_lower', sa.Integer(), nullable=True))
+    op.add_column('parking_forecasts', sa.Column('nowcast_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the nowcast columns; corrected predictions are kept as they are."""
+    op.drop_column('parking_forecasts', 'nowcast_at')
+    op.drop_column('parking_forecasts', 'baseline_free_spaces_lower')
+    op.drop_column('parking_forecasts', 'baseline_free_spaces')
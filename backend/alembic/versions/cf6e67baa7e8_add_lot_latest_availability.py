@@ -0,0 +1,44 @@
+"""add_lot_latest_availability
+
+Revision ID: cf6e67baa7e8
+Revises: 2a7a735cc076
+Create Date: 2026-10-17 17:21:45.346859
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cf6e67baa7e8'
+down_revision: Union[str, Sequence[str], None] = '2a7a735cc076'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create lot_latest_availability and backfill it from parking_snapshots."""
+    op.create_table('lot_latest_availability',
+    sa.Column('lot_id', sa.UUID(), nullable=False),
+    sa.Column('snapshot_id', sa.UUID(), nullable=False),
+    sa.Column('snapshot_collected_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('free_spaces', sa.Integer(), nullable=False),
+    sa.Column('occupancy_pct', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('collected_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['lot_id'], ['parking_lots.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('lot_id')
+    )
+    op.execute(
+        "INSERT INTO lot_latest_availability "
+        "(lot_id, snapshot_id, snapshot_collected_at, free_spaces, occupancy_pct, collected_at) "
+        "SELECT DISTINCT ON (lot_id) lot_id, id, collected_at, free_spaces, occupancy_pct, "
+        "coalesce(valid_until, collected_at) "
+        "FROM parking_snapshots ORDER BY lot_id, collected_at DESC"
+    )
+
+
+def downgrade() -> None:
+    """Drop lot_latest_availability."""
+    op.drop_table('lot_latest_availability')
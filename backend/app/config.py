@@ -9,11 +9,77 @@ class Settings(BaseSettings):
     # UCR API endpoint
     ucr_api_url: str = "https://lotspaces.ucr.edu/api/lots"
 
+    # Store a snapshot only when a lot's reading changes; unchanged readings
+    # extend the previous snapshot's valid_until instead of adding a row
+    snapshot_dedup: bool = False
+
+    # Local file that holds collections the database couldn't store until a
+    # later run replays them. Unset disables spooling; the file must be on a
+    # disk that survives restarts and deploys, or the spooled readings are lost
+    collector_spool_path: str | None = None
+
+    # Months of parking_snapshots partitions to keep created ahead of time
+    snapshot_partitions_ahead: int = 3
+
+    # Seconds an API worker serves cached lot availability before reloading;
+    # the collector's NOTIFY normally invalidates it sooner. 0 disables caching
+    availability_cache_ttl: float = 60.0
+
+    # Direct (session-mode) connection for LISTEN; defaults to DATABASE_URL,
+    # which doesn't deliver notifications through a transaction-mode pooler
+    database_listen_url: str = ""
+
+    # Processes used to train forecast models in parallel; 0 uses every CPU
+    forecast_workers: int = 0
+
+    # Forecast engine for every lot: "prophet" or "profile" (seasonal medians,
+    # milliseconds per lot). Overrides map lot names to an engine, e.g.
+    # FORECAST_ENGINE_OVERRIDES='{"Lot 30": "profile"}'
+    forecast_engine: str = "prophet"
+    forecast_engine_overrides: dict[str, str] = {}
+
+    # Directory keeping fitted Prophet models between forecast runs, so lots
+    # without enough new history reuse theirs. Unset disables the store; the
+    # directory must be on a disk that persists between runs to be of use
+    forecast_model_dir: str | None = None
+
+    # Seconds an API worker serves cached forecast series before reloading;
+    # the forecast job's and nowcast's NOTIFY normally invalidate it sooner.
+    # 0 disables caching
+    forecast_cache_ttl: float = 300.0
+
+    # Minutes for the collector's correction of upcoming forecasts toward the
+    # latest reading to decay by half; 0 disables it
+    nowcast_half_life_minutes: float = 60.0
+
     # Supabase Auth (optional for cron jobs that don't use auth)
     supabase_url: str = ""
     supabase_anon_key: str = ""
     supabase_service_role_key: str = ""
 
+    # Access tokens are verified locally: HS256 tokens against the JWT secret,
+    # RS256/ES256 tokens against the project's JWKS, refetched this often.
+    # Tokens no local key can check are sent to Supabase Auth unless the
+    # fallback is disabled
+    supabase_jwt_secret: str = ""
+    supabase_jwt_audience: str = "authenticated"
+    supabase_jwks_refresh_seconds: float = 600.0
+    auth_remote_fallback: bool = True
+
+    # Supabase Auth calls an API worker makes at once over its shared HTTP/2
+    # connection pool (more wait their turn), and seconds before one times out
+    supabase_auth_max_concurrency: int = 20
+    supabase_auth_timeout: float = 10.0
+
+    # Seconds an API worker reuses a resolved user, and how many it keeps;
+    # changes through the API invalidate it sooner. 0 disables caching
+    user_cache_ttl: float = 30.0
+    user_cache_size: int = 1024
+
+    # Seconds an API worker reuses its lot × building distance matrix;
+    # populate_distances invalidates it sooner. 0 disables caching
+    distance_cache_ttl: float = 3600.0
+
     # Mapbox
     mapbox_access_token: str
 
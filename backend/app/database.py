@@ -1,5 +1,6 @@
 from collections.abc import AsyncGenerator
 
+import asyncpg
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
@@ -30,3 +31,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def get_driver_connection(session: AsyncSession) -> asyncpg.Connection:
+    """
+    Return the raw asyncpg connection behind a session's current transaction.
+
+    Used for COPY, which SQLAlchemy doesn't expose. Work done on it is part of
+    the session's transaction.
+    """
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
@@ -1,13 +1,20 @@
+import uuid
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
 from app.database import get_db
 from app.models import User
-from app.services.auth import get_supabase_client
+from app.services.auth import get_user
+from app.services.token_verifier import (
+    InvalidTokenError,
+    UnverifiableTokenError,
+    get_token_verifier,
+)
+from app.services.user_cache import user_cache
 
 security = HTTPBearer(auto_error=False)
 
@@ -23,26 +30,42 @@ def _auth_error(detail: str) -> HTTPException:
     )
 
 
-async def get_current_user(
-    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
-    """Validate JWT and return the current user. Raises 401 if invalid."""
-    if not credentials:
-        raise _auth_error("Missing authentication token")
-
+async def _remote_supabase_id(token: str) -> uuid.UUID:
+    """Validate a token with Supabase Auth and return its user id."""
     try:
-        response = get_supabase_client().auth.get_user(credentials.credentials)
+        response = await get_user(token)
         supabase_user = response.user if response else None
         if not supabase_user:
             raise _auth_error("Invalid authentication token")
+        return uuid.UUID(supabase_user.id)
     except HTTPException:
         raise
     except Exception:
         raise _auth_error("Invalid authentication token") from None
 
-    result = await db.execute(select(User).where(User.supabase_id == supabase_user.id))
-    user = result.scalar_one_or_none()
+
+async def _verified_supabase_id(token: str) -> uuid.UUID:
+    """Verify a token locally, asking Supabase Auth only if no key can check it."""
+    try:
+        return await get_token_verifier().verify_subject(token)
+    except InvalidTokenError:
+        raise _auth_error("Invalid authentication token") from None
+    except UnverifiableTokenError:
+        if not get_settings().auth_remote_fallback:
+            raise _auth_error("Invalid authentication token") from None
+    return await _remote_supabase_id(token)
+
+
+async def get_current_user(
+    credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> User:
+    """Validate JWT and return the current user. Raises 401 if invalid."""
+    if not credentials:
+        raise _auth_error("Missing authentication token")
+
+    supabase_id = await _verified_supabase_id(credentials.credentials)
+    user = await user_cache.get_user(db, supabase_id)
 
     if not user:
         raise _auth_error("User not found")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -8,6 +9,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.routers import academic, auth, buildings, classrooms, feedback, forecasts, health, parking, permits, schedules
+from app.services.availability_cache import AVAILABILITY_CHANNEL, availability_cache
+from app.services.availability_stream import availability_broadcaster
+from app.services.cache import listen_for_invalidations
+from app.services.distance_matrix import DISTANCE_CHANNEL, distance_matrix
+from app.services.forecast_cache import forecast_cache
+from app.services.forecast_generations import FORECAST_CHANNEL
+from app.services.gotrue_client import close_gotrue_client
+from app.services.token_verifier import get_token_verifier
+from app.services.user_cache import USER_CHANNEL, user_cache
 
 # Configure logging
 logging.basicConfig(
@@ -21,7 +31,25 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Manage application startup and shutdown."""
     logger.info("Starting ParkSmart API...")
+    background = [
+        asyncio.create_task(
+            listen_for_invalidations(
+                {
+                    AVAILABILITY_CHANNEL: lambda _payload: availability_cache.invalidate(),
+                    FORECAST_CHANNEL: lambda _payload: forecast_cache.invalidate(),
+                    USER_CHANNEL: user_cache.invalidate_notified,
+                    DISTANCE_CHANNEL: lambda _payload: distance_matrix.invalidate(),
+                }
+            )
+        ),
+        asyncio.create_task(availability_broadcaster.run()),
+        asyncio.create_task(get_token_verifier().run_refresh()),
+    ]
     yield
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await close_gotrue_client()
     logger.info("ParkSmart API shutdown complete")
 
 
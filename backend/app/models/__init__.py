@@ -4,12 +4,14 @@ ParkSmart Database Models
 Models:
 - AcademicTerm, AcademicWeek: Academic calendar terms and weeks
 - ParkingLot, ParkingSnapshot: Lots and real-time occupancy data
+- LotLatestAvailability: Newest reading per lot, maintained by the collector
 - PermitType, LotPermitAccess: Permit types and lot access rules
 - Building, Classroom: Campus locations for proximity calculations
 - LotBuildingDistance: Precomputed walking distances from lots to buildings
 - User, UserSchedule, ScheduleEvent: Users and their class schedules
 - Feedback: Beta user feedback submissions
 - ParkingForecast: Pre-computed Prophet predictions for lot availability
+- ForecastGeneration: Forecast job runs; readers see the active one
 
 All models use UUID primary keys. See base.py for shared mixins.
 """
@@ -19,8 +21,9 @@ from app.models.base import Base
 from app.models.building import Building
 from app.models.classroom import Classroom
 from app.models.feedback import Feedback
-from app.models.forecast import ParkingForecast
+from app.models.forecast import ForecastGeneration, ParkingForecast
 from app.models.lot_building_distance import LotBuildingDistance
+from app.models.lot_latest_availability import LotLatestAvailability
 from app.models.parking_lot import ParkingLot
 from app.models.permit import LotPermitAccess, PermitType
 from app.models.schedule import ScheduleEvent, UserSchedule
@@ -34,7 +37,9 @@ __all__ = [
     "Building",
     "Classroom",
     "Feedback",
+    "ForecastGeneration",
     "LotBuildingDistance",
+    "LotLatestAvailability",
     "LotPermitAccess",
     "ParkingForecast",
     "ParkingLot",
@@ -1,4 +1,4 @@
-"""Parking forecast model - pre-computed Prophet predictions for lot availability."""
+"""Parking forecast models - pre-computed Prophet predictions and their runs."""
 
 from __future__ import annotations
 
@@ -17,6 +17,30 @@ if TYPE_CHECKING:
     from app.models.parking_lot import ParkingLot
 
 
+class ForecastGeneration(Base, UUIDMixin):
+    """One run of the forecast job; readers only see the active generation.
+
+    A generation's forecasts are written while it is inactive and become
+    visible together when activated_at is set. The most recently activated
+    generation is the active one.
+    """
+
+    __tablename__ = "forecast_generations"
+
+    model_version: Mapped[str] = mapped_column(String, nullable=False)
+    generated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    activated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    lot_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<ForecastGeneration(id={self.id}, activated_at={self.activated_at})>"
+
+
 class ParkingForecast(Base, UUIDMixin):
     """Pre-computed forecast of lot availability at a future timeslot."""
 
@@ -25,6 +49,9 @@ class ParkingForecast(Base, UUIDMixin):
     lot_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("parking_lots.id"), nullable=False
     )
+    generation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("forecast_generations.id"), nullable=False
+    )
     forecast_time: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
     )
@@ -37,6 +64,15 @@ class ParkingForecast(Base, UUIDMixin):
     generated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Model output before intraday nowcast corrections; null until corrected
+    baseline_free_spaces: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    baseline_free_spaces_lower: Mapped[int | None] = mapped_column(
+        Integer, nullable=True
+    )
+    # Collection the current correction is based on
+    nowcast_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     lot: Mapped[ParkingLot] = relationship("ParkingLot", back_populates="forecasts")
@@ -49,7 +85,13 @@ class ParkingForecast(Base, UUIDMixin):
 
 
 Index(
-    "idx_forecasts_lot_time",
+    "idx_forecast_generations_activated_at",
+    ForecastGeneration.activated_at,
+)
+
+Index(
+    "idx_forecasts_generation_lot_time",
+    ParkingForecast.generation_id,
     ParkingForecast.lot_id,
     ParkingForecast.forecast_time,
 )
@@ -40,8 +40,8 @@ class LotBuildingDistance(Base, UUIDMixin, TimestampMixin):
     duration_minutes: Mapped[Decimal] = mapped_column(Numeric(6, 2), nullable=False)
 
     # Relationships
-    lot: Mapped["ParkingLot"] = relationship("ParkingLot", back_populates="distances")
-    building: Mapped["Building"] = relationship("Building", back_populates="distances")
+    lot: Mapped[ParkingLot] = relationship("ParkingLot", back_populates="distances")
+    building: Mapped[Building] = relationship("Building", back_populates="distances")
 
     def __repr__(self) -> str:
         return (
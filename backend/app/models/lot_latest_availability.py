@@ -0,0 +1,55 @@
+"""Latest availability per lot, maintained by the collector at write time."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+if TYPE_CHECKING:
+    from app.models.parking_lot import ParkingLot
+
+
+class LotLatestAvailability(Base):
+    """Newest reading for a lot, upserted in the same transaction as its snapshot.
+
+    Lets availability reads use a primary-key join instead of scanning
+    parking_snapshots for each lot's most recent row.
+    """
+
+    __tablename__ = "lot_latest_availability"
+
+    lot_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("parking_lots.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Primary key of the parking_snapshots row holding this reading
+    snapshot_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    snapshot_collected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    free_spaces: Mapped[int] = mapped_column(Integer, nullable=False)
+    occupancy_pct: Mapped[Decimal | None] = mapped_column(Numeric(5, 2), nullable=True)
+    # Last collection that reported this reading
+    collected_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    # Relationships
+    lot: Mapped[ParkingLot] = relationship(
+        "ParkingLot", back_populates="latest_availability"
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LotLatestAvailability(lot_id={self.lot_id}, "
+            f"collected_at={self.collected_at})>"
+        )
@@ -13,6 +13,7 @@ from app.models.base import Base, TimestampMixin, UUIDMixin
 if TYPE_CHECKING:
     from app.models.forecast import ParkingForecast
     from app.models.lot_building_distance import LotBuildingDistance
+    from app.models.lot_latest_availability import LotLatestAvailability
     from app.models.permit import LotPermitAccess
     from app.models.snapshot import ParkingSnapshot
 
@@ -35,12 +36,18 @@ class ParkingLot(Base, UUIDMixin, TimestampMixin):
     permit_access: Mapped[list[LotPermitAccess]] = relationship(
         "LotPermitAccess", back_populates="lot", cascade="all, delete-orphan"
     )
-    distances: Mapped[list["LotBuildingDistance"]] = relationship(
+    distances: Mapped[list[LotBuildingDistance]] = relationship(
         "LotBuildingDistance", back_populates="lot", cascade="all, delete-orphan"
     )
-    forecasts: Mapped[list["ParkingForecast"]] = relationship(
+    forecasts: Mapped[list[ParkingForecast]] = relationship(
         "ParkingForecast", back_populates="lot", cascade="all, delete-orphan"
     )
+    latest_availability: Mapped[LotLatestAvailability | None] = relationship(
+        "LotLatestAvailability",
+        back_populates="lot",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     def __repr__(self) -> str:
         return f"<ParkingLot(name={self.name!r})>"
@@ -21,17 +21,26 @@ class ParkingSnapshot(Base, UUIDMixin):
     """Point-in-time record of lot occupancy (free_spaces, occupancy_pct, collected_at)."""
 
     __tablename__ = "parking_snapshots"
+    # Monthly range partitions are managed by app/services/partitions.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (collected_at)"}
 
     lot_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("parking_lots.id"), nullable=False
     )
     free_spaces: Mapped[int] = mapped_column(Integer, nullable=False)
     occupancy_pct: Mapped[Decimal | None] = mapped_column(Numeric(5, 2), nullable=True)
+    # Part of the primary key because it is the partition key
     collected_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False,
     )
+    # Last collection that reported the same reading (run-length encoding);
+    # NULL when the reading was only seen once. See app/services/snapshots.py.
+    valid_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     lot: Mapped[ParkingLot] = relationship("ParkingLot", back_populates="snapshots")
@@ -42,9 +51,11 @@ class ParkingSnapshot(Base, UUIDMixin):
         )
 
 
-# Index created after class definition to reference column properly
+# Index created after class definition to reference column properly; unique so
+# replayed readings can be skipped with ON CONFLICT (lot_id, collected_at)
 Index(
     "idx_snapshots_lot_time",
     ParkingSnapshot.lot_id,
     ParkingSnapshot.collected_at.desc(),
+    unique=True,
 )
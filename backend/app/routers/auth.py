@@ -30,6 +30,8 @@ from app.schemas import (
     UserResponse,
 )
 from app.services import auth as auth_service
+from app.services.cache import notify
+from app.services.user_cache import USER_CHANNEL, user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -149,7 +151,9 @@ async def delete_account(user: CurrentUser, db: DbSession) -> DeleteAccountRespo
         )
 
     await db.delete(user)
+    await notify(db, USER_CHANNEL, str(user.supabase_id))
     await db.commit()
+    user_cache.invalidate(user.supabase_id)
     return DeleteAccountResponse(message="Account deleted successfully")
 
 
@@ -195,7 +199,9 @@ async def update_preferences(
     if request.walking_speed is not None:
         user.walking_speed = request.walking_speed
 
+    await notify(db, USER_CHANNEL, str(user.supabase_id))
     await db.commit()
+    user_cache.invalidate(user.supabase_id)
     await db.refresh(user)
     return UserResponse.model_validate(user)
 
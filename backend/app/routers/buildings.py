@@ -1,13 +1,16 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import Building, LotBuildingDistance, ParkingLot
+from app.models import Building
 from app.schemas import BuildingLotsResponse, BuildingRead, ParkingLotWithDistance
+from app.services.availability_cache import availability_cache
+from app.services.conditional import etag_for, not_modified
+from app.services.distance_matrix import distance_matrix
 
 router = APIRouter(prefix="/api/buildings", tags=["buildings"])
 
@@ -36,10 +39,11 @@ async def search_buildings(
 @router.get("/{building_id}/lots", response_model=BuildingLotsResponse)
 async def get_building_lots(
     building_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: DbSession,
-) -> BuildingLotsResponse:
+) -> BuildingLotsResponse | Response:
     """Get a building with all parking lots sorted by walking distance."""
-    # Fetch building
     result = await db.execute(select(Building).where(Building.id == building_id))
     building = result.scalar_one_or_none()
     if not building:
@@ -48,18 +52,29 @@ async def get_building_lots(
             detail="Building not found",
         )
 
-    # Join distances with lots directly — avoids loading all lots into memory
-    dist_result = await db.execute(
-        select(LotBuildingDistance, ParkingLot)
-        .join(ParkingLot, LotBuildingDistance.lot_id == ParkingLot.id)
-        .where(LotBuildingDistance.building_id == building_id)
-        .order_by(LotBuildingDistance.distance_miles)
+    lots = await availability_cache.get_lots(db)
+    nearest = await distance_matrix.nearest_lots(db, building_id)
+    lots_by_id = {lot.id: lot for lot in lots}
+    ranked = [
+        (lots_by_id[lot_id], duration)
+        for lot_id, _, duration in nearest
+        if lot_id in lots_by_id
+    ]
+
+    # Distances and lots only change through updates that advance updated_at,
+    # or through deletions, which only the lot count shows, so there's no
+    # Last-Modified
+    lots_updated_at = max((lot.updated_at for lot, _ in ranked), default=None)
+    etag = etag_for(
+        building.updated_at, len(ranked), distance_matrix.updated_at, lots_updated_at
     )
+    if cached := not_modified(request, response, etag):
+        return cached
 
     lot_responses = []
-    for dist, lot in dist_result.all():
+    for lot, duration in ranked:
         item = ParkingLotWithDistance.model_validate(lot)
-        item.travel_minutes = round(float(dist.duration_minutes), 1)
+        item.travel_minutes = round(duration, 1)
         lot_responses.append(item)
 
     return BuildingLotsResponse(
@@ -1,4 +1,5 @@
 import uuid
+from collections.abc import Sequence
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -7,14 +8,24 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
-from app.models import Classroom, ParkingLot, LotBuildingDistance
-from app.schemas import ClassroomLotsResponse, ClassroomWithBuilding, ParkingLotWithDistance
+from app.models import Classroom, ParkingLot
+from app.schemas import (
+    ClassroomLotsResponse,
+    ClassroomWithBuilding,
+    ParkingLotRead,
+    ParkingLotWithAvailability,
+    ParkingLotWithDistance,
+)
+from app.services.availability_cache import availability_cache
+from app.services.distance_matrix import distance_matrix
 from app.services.loc_distance import driving_distance_to_lots
 
 router = APIRouter(prefix="/api/classrooms", tags=["classrooms"])
 
 
-def _to_lot_responses(lot_tuples: list[tuple[ParkingLot, float]]) -> list[ParkingLotWithDistance]:
+def _to_lot_responses(
+    lot_tuples: Sequence[tuple[ParkingLot | ParkingLotRead, float]],
+) -> list[ParkingLotWithDistance]:
     """Convert (lot, duration_minutes) tuples to ParkingLotWithDistance schemas."""
     result = []
     for lot, duration in lot_tuples:
@@ -43,31 +54,18 @@ async def _get_classroom(classroom_id: uuid.UUID, db: AsyncSession) -> Classroom
 
 
 async def _sort_lots_by_walking_distance(
-    classroom: Classroom, lots: list[ParkingLot], db: AsyncSession
-) -> list[tuple[ParkingLot, float]]:
-    # Calculate walking distances from each lot to the classroom's building
-    # coordinates and return lots sorted closest to farthest.
-
-    lotID = [lot.id for lot in lots]
-    buildingID = classroom.building.id
-
-    result = await db.execute(select(LotBuildingDistance).where(LotBuildingDistance.building_id == buildingID).where(LotBuildingDistance.lot_id.in_(lotID)))
-    precomputed_distances = result.scalars().all()
-
-    # Store (distance_miles, duration_minutes) per lot for sorting and response
-    distance_map: dict[uuid.UUID, tuple[float, float]] = {}
-    for distance in precomputed_distances:
-        distance_map[distance.lot_id] = (float(distance.distance_miles), float(distance.duration_minutes))
-
-    # Sort lots from closest to farthest via walking distance, return (lot, duration_minutes)
-    lotData = []
-    for lot in lots:
-        if lot.id in distance_map:
-            dist, duration = distance_map[lot.id]
-            lotData.append((lot, dist, duration))
-
-    lotData.sort(key=lambda x: x[1])  # Sort by distance
-    return [(lot, duration) for lot, _, duration in lotData]
+    classroom: Classroom, lots: list[ParkingLotWithAvailability], db: AsyncSession
+) -> list[tuple[ParkingLotWithAvailability, float]]:
+    # Look up walking distances from each lot to the classroom's building in
+    # the in-memory distance matrix, which already orders them closest first.
+
+    lots_by_id = {lot.id: lot for lot in lots}
+    nearest = await distance_matrix.nearest_lots(db, classroom.building.id)
+    return [
+        (lots_by_id[lot_id], duration)
+        for lot_id, _, duration in nearest
+        if lot_id in lots_by_id
+    ]
 
 @router.get("/lots/from-location", response_model=list[ParkingLotWithDistance])
 async def get_nearest_lots_from_location(latitude: float, longitude: float, db: DbSession) -> list[ParkingLotWithDistance]:
@@ -105,8 +103,7 @@ async def get_nearest_lots(
             detail="Classroom has no mapped building; cannot calculate distances",
         )
 
-    lots_result = await db.execute(select(ParkingLot))
-    lots = list(lots_result.scalars().all())
+    lots = await availability_cache.get_lots(db)
     sorted_lot_tuples = await _sort_lots_by_walking_distance(classroom, lots, db)
 
     return ClassroomLotsResponse(
@@ -1,23 +1,38 @@
-"""Forecast endpoint — returns pre-computed Prophet predictions for a lot."""
+"""Forecast endpoints — pre-computed Prophet predictions for lots."""
 
 import uuid
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import ParkingForecast, ParkingLot
-from app.schemas import ForecastResponse, ParkingForecastRead
+from app.schemas import (
+    ForecastResponse,
+    ForecastsAtResponse,
+    ForecastSeriesResponse,
+    ParkingForecastRead,
+)
+from app.services.conditional import etag_for, not_modified
+from app.services.forecast_cache import forecast_cache
+from app.services.forecast_generations import active_generation
+from app.services.timegrid import TIER_INTERVALS
 
-router = APIRouter(prefix="/api/lots", tags=["forecasts"])
+router = APIRouter(tags=["forecasts"])
 
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
+# Steps finer than the finest forecast slots only add interpolated points
+MIN_SERIES_STEP = min(TIER_INTERVALS.values())
 
-@router.get("/{lot_id}/forecast", response_model=ForecastResponse)
-async def get_forecast(lot_id: uuid.UUID, db: DbSession) -> ForecastResponse:
+
+@router.get("/api/lots/{lot_id}/forecast", response_model=ForecastResponse)
+async def get_forecast(
+    lot_id: uuid.UUID, request: Request, response: Response, db: DbSession
+) -> ForecastResponse | Response:
     """Get pre-computed 7-day forecast for a parking lot."""
     # Verify lot exists
     lot_result = await db.execute(
@@ -27,13 +42,31 @@ async def get_forecast(lot_id: uuid.UUID, db: DbSession) -> ForecastResponse:
     if not lot:
         raise HTTPException(status_code=404, detail="Lot not found")
 
+    # Resolve the active generation once so both queries read the same run
+    generation_id = await db.scalar(active_generation())
+    in_generation = (
+        ParkingForecast.generation_id == generation_id,
+        ParkingForecast.lot_id == lot_id,
+        ParkingForecast.forecast_time >= func.now(),
+    )
+
+    # An active generation only changes through nowcast corrections, so it,
+    # the first future slot and the latest correction determine the response
+    marker_result = await db.execute(
+        select(
+            func.min(ParkingForecast.forecast_time),
+            func.max(ParkingForecast.nowcast_at),
+        ).where(*in_generation)
+    )
+    etag = etag_for(lot.name, generation_id, *marker_result.one())
+    # Forecasts drop out as time passes, so Last-Modified would understate changes
+    if cached := not_modified(request, response, etag):
+        return cached
+
     # Fetch future forecasts ordered by time
     stmt = (
         select(ParkingForecast)
-        .where(
-            ParkingForecast.lot_id == lot_id,
-            ParkingForecast.forecast_time >= func.now(),
-        )
+        .where(*in_generation)
         .order_by(ParkingForecast.forecast_time)
     )
     result = await db.execute(stmt)
@@ -47,3 +80,47 @@ async def get_forecast(lot_id: uuid.UUID, db: DbSession) -> ForecastResponse:
         generated_at=generated_at,
         forecasts=[ParkingForecastRead.model_validate(f) for f in forecasts],
     )
+
+
+@router.get("/api/forecasts/at", response_model=ForecastsAtResponse)
+async def get_forecasts_at(
+    at: Annotated[datetime, Query(alias="time")],
+    db: DbSession,
+    lot_ids: Annotated[list[uuid.UUID] | None, Query()] = None,
+) -> ForecastsAtResponse:
+    """
+    Get forecasts for many lots at one instant, interpolated between slots.
+
+    Defaults to every lot; lots without forecasts around `time` are omitted.
+    """
+    forecasts = await forecast_cache.forecasts_at(db, at, lot_ids)
+    return ForecastsAtResponse(time=at, forecasts=forecasts)
+
+
+@router.get("/api/forecasts", response_model=ForecastSeriesResponse)
+async def get_forecast_series(
+    db: DbSession,
+    lot_ids: Annotated[list[uuid.UUID] | None, Query()] = None,
+    start: Annotated[datetime | None, Query(alias="from")] = None,
+    end: Annotated[datetime | None, Query(alias="to")] = None,
+    step: Annotated[timedelta | None, Query()] = None,
+) -> ForecastSeriesResponse:
+    """
+    Get forecast series for many lots in one response, on a shared time axis.
+
+    Runs from `from` (default now) to `to` (default the end of the forecasts),
+    sampled every `step` (an ISO 8601 duration such as PT1H) or at every
+    forecast slot. Defaults to every lot.
+    """
+    if step is not None and step < MIN_SERIES_STEP:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"step must be at least {MIN_SERIES_STEP.total_seconds():.0f}s",
+        )
+    start = start or datetime.now(UTC)
+    if end is not None and end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to must not be before from",
+        )
+    return await forecast_cache.series_between(db, start, end, step, lot_ids)
@@ -1,13 +1,18 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import desc, select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import ParkingSnapshot
-from app.schemas import CollectionResponse, HealthResponse
+from app.models import LotLatestAvailability
+from app.schemas import AuthClientStats, CacheStats, CollectionResponse, HealthResponse
+from app.services.availability_cache import availability_cache
 from app.services.collector import collect_parking_data
+from app.services.distance_matrix import distance_matrix
+from app.services.forecast_cache import forecast_cache
+from app.services.gotrue_client import get_gotrue_client
+from app.services.user_cache import user_cache
 
 router = APIRouter(tags=["health"])
 
@@ -17,11 +22,7 @@ DbSession = Annotated[AsyncSession, Depends(get_db)]
 @router.get("/health", response_model=HealthResponse)
 async def health_check(db: DbSession) -> HealthResponse:
     """Check API health status and last collection time."""
-    stmt = (
-        select(ParkingSnapshot.collected_at)
-        .order_by(desc(ParkingSnapshot.collected_at))
-        .limit(1)
-    )
+    stmt = select(func.max(LotLatestAvailability.collected_at))
     result = await db.execute(stmt)
     last_collection = result.scalar_one_or_none()
 
@@ -31,6 +32,23 @@ async def health_check(db: DbSession) -> HealthResponse:
     )
 
 
+@router.get("/health/caches", response_model=dict[str, CacheStats])
+async def cache_stats() -> dict[str, CacheStats]:
+    """Report hit/miss counters for this worker's in-process caches."""
+    return {
+        "availability": availability_cache.stats(),
+        "forecasts": forecast_cache.stats(),
+        "users": user_cache.stats(),
+        "distances": distance_matrix.stats(),
+    }
+
+
+@router.get("/health/auth", response_model=AuthClientStats)
+async def auth_client_stats() -> AuthClientStats:
+    """Report this worker's Supabase Auth call counts and latency."""
+    return get_gotrue_client().stats()
+
+
 @router.post("/api/collect", response_model=CollectionResponse)
 async def trigger_collection() -> CollectionResponse:
     """Manually trigger a parking data collection."""
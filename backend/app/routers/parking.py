@@ -1,17 +1,32 @@
 import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import async_session_maker, get_db
 from app.models import ParkingLot, ParkingSnapshot
 from app.schemas import (
     PaginatedSnapshots,
     ParkingLotWithAvailability,
     ParkingSnapshotRead,
 )
+from app.services.availability_cache import availability_cache, lot_validators
+from app.services.availability_stream import availability_broadcaster, encode_updates
+from app.services.conditional import not_modified
+from app.services.snapshots import expanded_snapshots
 
 router = APIRouter(prefix="/api/lots", tags=["parking"])
 
@@ -19,92 +34,58 @@ DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 
 @router.get("", response_model=list[ParkingLotWithAvailability])
-async def list_lots(db: DbSession) -> list[ParkingLotWithAvailability]:
+async def list_lots(
+    request: Request, response: Response, db: DbSession
+) -> list[ParkingLotWithAvailability] | Response:
     """Get all parking lots with their latest availability."""
-    # Subquery to get the latest snapshot for each lot
-    latest_snapshot_subq = (
-        select(
-            ParkingSnapshot.lot_id,
-            ParkingSnapshot.free_spaces,
-            ParkingSnapshot.occupancy_pct,
-            ParkingSnapshot.collected_at,
-        )
-        .distinct(ParkingSnapshot.lot_id)
-        .order_by(ParkingSnapshot.lot_id, desc(ParkingSnapshot.collected_at))
-        .subquery()
-    )
-
-    # Main query joining lots with latest snapshots
-    stmt = (
-        select(
-            ParkingLot,
-            latest_snapshot_subq.c.free_spaces,
-            latest_snapshot_subq.c.occupancy_pct,
-            latest_snapshot_subq.c.collected_at.label("availability_updated_at"),
-        )
-        .outerjoin(latest_snapshot_subq, ParkingLot.id == latest_snapshot_subq.c.lot_id)
-        .order_by(ParkingLot.name)
-    )
+    etag = await availability_cache.get_lots_etag(db)
+    if cached := not_modified(request, response, etag):
+        return cached
+    lots = await availability_cache.get_lots(db)
+    # The list may have moved on since the check; describe what is sent
+    response.headers["ETag"] = availability_cache.etag
+    return lots
 
-    result = await db.execute(stmt)
-    rows = result.all()
-
-    lots = []
-    for row in rows:
-        lot = row[0]
-        lots.append(
-            ParkingLotWithAvailability(
-                id=lot.id,
-                name=lot.name,
-                address=lot.address,
-                total_spaces=lot.total_spaces,
-                latitude=lot.latitude,
-                longitude=lot.longitude,
-                created_at=lot.created_at,
-                updated_at=lot.updated_at,
-                free_spaces=row[1],
-                occupancy_pct=row[2],
-                availability_updated_at=row[3],
-            )
-        )
 
-    return lots
+@router.get("/stream")
+async def stream_availability() -> StreamingResponse:
+    """
+    Stream live availability as Server-Sent Events.
+
+    Starts with every lot, then sends the lots that changed after each
+    collection as `availability` events.
+    """
+    # The session is released before streaming so idle streams hold no connection
+    async with async_session_maker() as session:
+        lots = await availability_cache.get_lots(session)
+    queue = availability_broadcaster.subscribe()
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            yield encode_updates(lots)
+            while (frame := await queue.get()) is not None:
+                yield frame
+        finally:
+            availability_broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{lot_id}", response_model=ParkingLotWithAvailability)
-async def get_lot(lot_id: uuid.UUID, db: DbSession) -> ParkingLotWithAvailability:
+async def get_lot(
+    lot_id: uuid.UUID, request: Request, response: Response, db: DbSession
+) -> ParkingLotWithAvailability | Response:
     """Get a single parking lot by ID with latest availability."""
-    # Get the lot
-    stmt = select(ParkingLot).where(ParkingLot.id == lot_id)
-    result = await db.execute(stmt)
-    lot = result.scalar_one_or_none()
-
+    lot = await availability_cache.get_lot(db, lot_id)
     if not lot:
         raise HTTPException(status_code=404, detail="Lot not found")
 
-    # Get latest snapshot
-    snapshot_stmt = (
-        select(ParkingSnapshot)
-        .where(ParkingSnapshot.lot_id == lot_id)
-        .order_by(desc(ParkingSnapshot.collected_at))
-        .limit(1)
-    )
-    snapshot_result = await db.execute(snapshot_stmt)
-    snapshot = snapshot_result.scalar_one_or_none()
-
-    return ParkingLotWithAvailability(
-        id=lot.id,
-        name=lot.name,
-        address=lot.address,
-        total_spaces=lot.total_spaces,
-        latitude=lot.latitude,
-        longitude=lot.longitude,
-        created_at=lot.created_at,
-        updated_at=lot.updated_at,
-        free_spaces=snapshot.free_spaces if snapshot else None,
-        occupancy_pct=snapshot.occupancy_pct if snapshot else None,
-        availability_updated_at=snapshot.collected_at if snapshot else None,
-    )
+    etag, last_modified = lot_validators(lot)
+    return not_modified(request, response, etag, last_modified) or lot
 
 
 @router.get("/{lot_id}/history", response_model=PaginatedSnapshots)
@@ -113,34 +94,48 @@ async def get_lot_history(
     db: DbSession,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
+    start: Annotated[datetime | None, Query(alias="from")] = None,
+    end: Annotated[datetime | None, Query(alias="to")] = None,
 ) -> PaginatedSnapshots:
-    """Get historical snapshots for a parking lot with pagination."""
+    """
+    Get historical snapshots for a parking lot with pagination.
+
+    `from` and `to` limit the history to [from, to); without them every
+    snapshot is counted and paged.
+    """
+    if start is not None and end is not None and end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to must not be before from",
+        )
     # Verify lot exists
     lot_stmt = select(ParkingLot.id).where(ParkingLot.id == lot_id)
     lot_result = await db.execute(lot_stmt)
     if not lot_result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Lot not found")
 
-    # Count total snapshots
-    count_stmt = (
-        select(func.count())
-        .select_from(ParkingSnapshot)
-        .where(ParkingSnapshot.lot_id == lot_id)
+    # Runs of unchanged readings are expanded back into one row per collection
+    expanded = expanded_snapshots(
+        ParkingSnapshot.lot_id == lot_id, start=start, end=end
     )
+
+    # Count total snapshots
+    count_stmt = select(func.count()).select_from(expanded.subquery())
     total_result = await db.execute(count_stmt)
     total = total_result.scalar() or 0
 
     # Get paginated snapshots
     offset = (page - 1) * per_page
     snapshots_stmt = (
-        select(ParkingSnapshot)
-        .where(ParkingSnapshot.lot_id == lot_id)
-        .order_by(desc(ParkingSnapshot.collected_at))
+        expanded.order_by(
+            desc(ParkingSnapshot.collected_at),
+            desc(expanded.selected_columns.collected_at),
+        )
         .offset(offset)
         .limit(per_page)
     )
     snapshots_result = await db.execute(snapshots_stmt)
-    snapshots = snapshots_result.scalars().all()
+    snapshots = snapshots_result.all()
 
     pages = (total + per_page - 1) // per_page if total > 0 else 1
 
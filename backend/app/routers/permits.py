@@ -3,13 +3,15 @@ from datetime import UTC, datetime
 from zoneinfo import ZoneInfo
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import and_, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import and_, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import LotPermitAccess, ParkingLot, PermitType
 from app.schemas import ParkingLotRead, PermitTypeRead
+from app.services.conditional import etag_for, not_modified
 
 router = APIRouter(prefix="/api/permits", tags=["permits"])
 
@@ -19,8 +21,27 @@ PACIFIC = ZoneInfo("America/Los_Angeles")
 
 
 @router.get("", response_model=list[PermitTypeRead])
-async def list_permits(db: DbSession) -> list[PermitTypeRead]:
+async def list_permits(
+    request: Request, response: Response, db: DbSession
+) -> list[PermitTypeRead] | Response:
     """Get all permit types."""
+    # permit_types has no timestamps, but it is small enough to digest in SQL
+    digest_result = await db.execute(
+        select(
+            func.md5(
+                func.string_agg(
+                    func.concat_ws(
+                        "|", PermitType.id, PermitType.name, PermitType.description
+                    ),
+                    aggregate_order_by(literal_column("';'"), PermitType.name),
+                )
+            )
+        )
+    )
+    etag = etag_for(digest_result.scalar_one())
+    if cached := not_modified(request, response, etag):
+        return cached
+
     stmt = select(PermitType).order_by(PermitType.name)
     result = await db.execute(stmt)
     permits = result.scalars().all()
@@ -47,6 +47,13 @@ class ParkingLotWithAvailability(ParkingLotRead):
     availability_updated_at: datetime | None = None
 
 
+class LotAvailabilityUpdate(BaseModel):
+    lot_id: uuid.UUID
+    free_spaces: int | None = None
+    occupancy_pct: Decimal | None = None
+    collected_at: datetime | None = None
+
+
 class ParkingForecastRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -67,6 +74,30 @@ class ForecastResponse(BaseModel):
     forecasts: list[ParkingForecastRead]
 
 
+class ForecastAtTime(BaseModel):
+    lot_id: uuid.UUID
+    predicted_free_spaces: float  # interpolated between forecast slots
+    predicted_free_spaces_lower: float
+    predicted_occupancy_pct: float | None = None
+
+
+class ForecastsAtResponse(BaseModel):
+    time: datetime
+    forecasts: list[ForecastAtTime]
+
+
+class LotForecastSeries(BaseModel):
+    lot_id: uuid.UUID
+    # Aligned with ForecastSeriesResponse.times; None outside the lot's forecasts
+    predicted_free_spaces: list[float | None]
+    predicted_free_spaces_lower: list[float | None]
+
+
+class ForecastSeriesResponse(BaseModel):
+    times: list[datetime]
+    series: list[LotForecastSeries]
+
+
 class PaginatedSnapshots(BaseModel):
     items: list[ParkingSnapshotRead]
     total: int
@@ -80,6 +111,28 @@ class HealthResponse(BaseModel):
     last_collection: datetime | None = None
 
 
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+    hit_rate: float | None = None
+    size: int
+    age_seconds: float | None = None  # since the cached copy was loaded
+
+
+class UpstreamStats(BaseModel):
+    calls: int
+    errors: int
+    mean_ms: float | None = None
+    max_ms: float
+
+
+class AuthClientStats(BaseModel):
+    in_flight: int
+    waiting: int  # calls queued for a free slot
+    operations: dict[str, UpstreamStats]
+
+
 class CollectionResponse(BaseModel):
     status: str
     lots_updated: int
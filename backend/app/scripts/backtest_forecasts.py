@@ -0,0 +1,352 @@
+"""
+Backtest the forecast engines against stored history.
+
+Replays history with rolling-origin cutoffs: for each cutoff, every engine in
+app.services.forecasting.ENGINES is trained on the snapshots before it (term
+weeks only, as in the nightly job) and scored on the readings in the horizon
+after it. Reports MAE, MAPE (over readings with free spaces) and how often the
+reading is at or above predicted_free_spaces_lower, overall and per lot,
+horizon bucket and collection tier, with training time and peak memory per
+fit. Fits run in parallel on a process pool; the report is written as JSON.
+
+Peak memory is what tracemalloc sees in the worker (Python and NumPy
+allocations), so Stan's sampler process is not included for Prophet.
+
+Usage:
+    cd backend
+    python -m app.scripts.backtest_forecasts
+    python -m app.scripts.backtest_forecasts --engines profile --cutoffs 8 --step-days 3
+    python -m app.scripts.backtest_forecasts --until 2026-03-20 --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import exists, select
+
+from app.config import get_settings
+from app.database import async_session_maker
+from app.models import AcademicWeek, ParkingLot
+from app.services.forecasting import (
+    ENGINES,
+    FORECAST_DAYS,
+    MIN_SNAPSHOTS,
+    stream_histories,
+)
+from app.services.timegrid import MIDDAY, OFFPEAK, RUSH, tiers
+
+# Upper edge in hours and label of each horizon bucket
+HORIZON_BUCKETS = [
+    (1, "0-1h"),
+    (6, "1-6h"),
+    (24, "6-24h"),
+    (72, "1-3d"),
+    (float("inf"), "3d+"),
+]
+
+
+# (lot name, capacity, collected_at as naive UTC datetime64[us], free_spaces)
+LotHistory = tuple[str, int, np.ndarray, np.ndarray]
+# One fit's share of a LotHistory: (lot name, capacity, training times and
+# free spaces before the cutoff, times and free spaces in the horizon after it)
+FitData = tuple[str, int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+async def load_histories() -> list[LotHistory]:
+    """Load every lot's history the way the nightly forecast job does."""
+    async with async_session_maker() as session:
+        has_weeks = bool(
+            (await session.execute(select(exists(select(AcademicWeek.id))))).scalar()
+        )
+        lots = {
+            lot.id: lot
+            for lot in (await session.execute(select(ParkingLot))).scalars().all()
+        }
+
+        histories: list[LotHistory] = []
+        async for lot_id, times, free in stream_histories(session, has_weeks):
+            lot = lots.get(lot_id)
+            if lot is None or not len(times):
+                continue
+            capacity = lot.total_spaces or int(free.max())
+            histories.append((lot.name, capacity, times, free))
+    return histories
+
+
+def split_history(
+    history: LotHistory, cutoff: np.datetime64, horizon: np.timedelta64
+) -> FitData | None:
+    """
+    Split a lot's history at `cutoff` into training and horizon readings.
+
+    Returns None without enough training data or readings to score.
+    """
+    lot_name, capacity, times, free = history
+    train = times < cutoff
+    actual = (times >= cutoff) & (times < cutoff + horizon)
+    if train.sum() < MIN_SNAPSHOTS or not actual.any():
+        return None
+    return lot_name, capacity, times[train], free[train], times[actual], free[actual]
+
+
+def _horizon_buckets(hours: np.ndarray) -> np.ndarray:
+    edges = [edge for edge, _ in HORIZON_BUCKETS]
+    labels = np.array([label for _, label in HORIZON_BUCKETS])
+    return labels[np.searchsorted(edges, hours, side="left")]
+
+
+def backtest_fit(engine: str, data: FitData, cutoff: np.datetime64) -> dict[str, Any]:
+    """
+    Train `engine` on history before `cutoff` and predict the horizon after it.
+
+    Runs in a worker process, so it receives only the history split_history
+    kept for this cutoff. Returns the scored points with the fit's training
+    time and peak traced memory.
+    """
+    lot_name, capacity, train_times, train_free, horizon_times, actual = data
+    history_df = pd.DataFrame({"collected_at": train_times, "free_spaces": train_free})
+    actual_times = pd.DatetimeIndex(horizon_times)
+    future_times = actual_times.tz_localize(UTC).to_pydatetime().tolist()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    forecast_df = ENGINES[engine](history_df, future_times, capacity)
+    seconds = time.perf_counter() - started
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    hours = (actual_times - pd.Timestamp(cutoff)).total_seconds().to_numpy() / 3600
+    return {
+        "points": pd.DataFrame(
+            {
+                "engine": engine,
+                "lot": lot_name,
+                "cutoff": pd.Timestamp(cutoff),
+                "horizon": _horizon_buckets(hours),
+                "tier": tiers(actual_times),
+                "actual": actual,
+                "predicted": forecast_df["predicted_free"].to_numpy(),
+                "lower": forecast_df["predicted_free_lower"].to_numpy(),
+            }
+        ),
+        "seconds": seconds,
+        "peak_bytes": peak_bytes,
+    }
+
+
+def _round(value: float) -> float | None:
+    return None if pd.isna(value) else round(float(value), 4)
+
+
+def score(points: pd.DataFrame) -> dict[str, Any]:
+    """MAE, MAPE (%) over readings above zero and lower-bound coverage."""
+    error = (points["predicted"] - points["actual"]).abs()
+    nonzero = points["actual"] > 0
+    return {
+        "n": len(points),
+        "mae": _round(error.mean()),
+        "mape": _round((error[nonzero] / points["actual"][nonzero]).mean() * 100),
+        "lower_coverage": _round((points["actual"] >= points["lower"]).mean()),
+    }
+
+
+def build_report(
+    points: pd.DataFrame, fits: pd.DataFrame, cutoffs: list[datetime], args: Any
+) -> dict[str, Any]:
+    # Report buckets and tiers in time order rather than alphabetically
+    points["horizon"] = pd.Categorical(
+        points["horizon"], [label for _, label in HORIZON_BUCKETS]
+    )
+    points["tier"] = pd.Categorical(points["tier"], [RUSH, MIDDAY, OFFPEAK])
+
+    engines: dict[str, Any] = {}
+    for engine, engine_points in points.groupby("engine"):
+        engine_fits = fits[fits["engine"] == engine]
+        engines[engine] = {
+            "overall": score(engine_points),
+            "training": {
+                "fits": len(engine_fits),
+                "failed": int(engine_fits["failed"].sum()),
+                "seconds_total": _round(engine_fits["seconds"].sum()),
+                "seconds_mean": _round(engine_fits["seconds"].mean()),
+                "seconds_max": _round(engine_fits["seconds"].max()),
+                "peak_memory_mb_mean": _round(engine_fits["peak_bytes"].mean() / 2**20),
+                "peak_memory_mb_max": _round(engine_fits["peak_bytes"].max() / 2**20),
+            },
+            **{
+                f"by_{column}": {
+                    str(key): score(group)
+                    for key, group in engine_points.groupby(
+                        column, sort=True, observed=True
+                    )
+                }
+                for column in ("lot", "horizon", "tier")
+            },
+        }
+
+    return {
+        "generated_at": datetime.now(UTC).isoformat(),
+        "cutoffs": [cutoff.isoformat() for cutoff in cutoffs],
+        "horizon_days": args.horizon_days,
+        "step_days": args.step_days,
+        "min_snapshots": MIN_SNAPSHOTS,
+        "engines": engines,
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    histories = asyncio.run(load_histories())
+    if args.lots:
+        histories = [history for history in histories if history[0] in args.lots]
+    if not histories:
+        raise SystemExit("No snapshot history to backtest.")
+
+    until: np.datetime64
+    if args.until:
+        until = np.datetime64(args.until.replace(tzinfo=None), "us")
+    else:
+        # Just past the latest reading, so it is scored too
+        until = max(times[-1] for _, _, times, _ in histories) + np.timedelta64(1, "us")
+    horizon = pd.Timedelta(days=args.horizon_days).to_timedelta64()
+    step = pd.Timedelta(days=args.step_days).to_timedelta64()
+    # Oldest first, each followed by a full horizon of readings
+    cutoff_points: list[np.datetime64] = [
+        until - horizon - step * k for k in reversed(range(args.cutoffs))
+    ]
+    cutoffs = [
+        pd.Timestamp(cutoff).tz_localize(UTC).to_pydatetime()
+        for cutoff in cutoff_points
+    ]
+    print(
+        f"Loaded {sum(len(times) for _, _, times, _ in histories)} snapshots for "
+        f"{len(histories)} lots in {time.perf_counter() - started:.1f}s"
+    )
+    print(f"Cutoffs: {', '.join(c.strftime('%Y-%m-%d %H:%M') for c in cutoffs)}")
+
+    workers = args.workers or get_settings().forecast_workers or os.cpu_count() or 1
+    parts: list[pd.DataFrame] = []
+    fits: list[dict[str, Any]] = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        # Each task gets only its cutoff's slice of the lot's history
+        splits = [
+            (cutoff, data)
+            for cutoff in cutoff_points
+            for history in histories
+            if (data := split_history(history, cutoff, horizon)) is not None
+        ]
+        futures = {
+            pool.submit(backtest_fit, engine, data, cutoff): (engine, data[0])
+            for cutoff, data in splits
+            for engine in args.engines
+        }
+        for future in as_completed(futures):
+            engine, lot_name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  {engine} failed for {lot_name}: {e}")
+                fits.append(
+                    {
+                        "engine": engine,
+                        "seconds": np.nan,
+                        "peak_bytes": np.nan,
+                        "failed": True,
+                    }
+                )
+                continue
+            parts.append(result["points"])
+            fits.append(
+                {
+                    "engine": engine,
+                    "seconds": result["seconds"],
+                    "peak_bytes": result["peak_bytes"],
+                    "failed": False,
+                }
+            )
+
+    elapsed = time.perf_counter() - started
+    if not parts:
+        raise SystemExit("No cutoff had enough history and readings to score.")
+    fits_df = pd.DataFrame(fits)
+    report = build_report(pd.concat(parts, ignore_index=True), fits_df, cutoffs, args)
+    report["wall_seconds"] = round(elapsed, 2)
+    report["workers"] = workers
+
+    print(f"\nRan {len(fits)} fits in {elapsed:.1f}s on {workers} workers\n")
+    print(
+        f"{'engine':<10} {'n':>8} {'MAE':>8} {'MAPE %':>8} {'lower cov':>10} "
+        f"{'s/fit':>8} {'peak MB':>8}"
+    )
+    for engine, result in report["engines"].items():
+        overall, training = result["overall"], result["training"]
+        print(
+            f"{engine:<10} {overall['n']:>8} {overall['mae'] or 0:>8.2f} "
+            f"{overall['mape'] or 0:>8.2f} {overall['lower_coverage'] or 0:>10.3f} "
+            f"{training['seconds_mean'] or 0:>8.3f} "
+            f"{training['peak_memory_mb_max'] or 0:>8.1f}"
+        )
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=sorted(ENGINES),
+        default=sorted(ENGINES),
+        help="Engines to compare (default: all)",
+    )
+    parser.add_argument(
+        "--cutoffs", type=int, default=4, help="Rolling origins to score (default: 4)"
+    )
+    parser.add_argument(
+        "--step-days",
+        type=float,
+        default=7,
+        help="Days between consecutive cutoffs (default: 7)",
+    )
+    parser.add_argument(
+        "--horizon-days",
+        type=float,
+        default=FORECAST_DAYS,
+        help=f"Days scored after each cutoff (default: {FORECAST_DAYS})",
+    )
+    parser.add_argument(
+        "--until",
+        type=lambda value: datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=UTC),
+        default=None,
+        metavar="YYYY-MM-DD",
+        help="End of the last cutoff's horizon (default: the latest snapshot)",
+    )
+    parser.add_argument("--lots", nargs="+", help="Only backtest these lot names")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes (default: FORECAST_WORKERS, or every CPU)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("backtest-report.json"),
+        help="Where to write the JSON report (default: backtest-report.json)",
+    )
+    run(parser.parse_args())
@@ -0,0 +1,109 @@
+"""
+Benchmark the vectorized forecast timegrid against the per-slot loop it replaced.
+
+Times building 7-day forecast timeslots with the old loop, with empty caches
+and with the same start already memoized, and reports where the two disagree.
+Differences are expected only around DST changes, where the loop repeated a
+slot in spring and skipped the repeated hour in autumn.
+
+Usage:
+    cd backend
+    python -m app.scripts.benchmark_timegrid
+    python -m app.scripts.benchmark_timegrid --starts 200 --repeat 5
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from app.services.forecasting import FORECAST_DAYS
+from app.services.timegrid import (
+    PACIFIC,
+    TIER_INTERVALS,
+    _forecast_slots,
+    forecast_times,
+    tier_for,
+    tiered_grid,
+)
+
+
+def loop_forecast_times(start: datetime, days: int) -> list[datetime]:
+    """The previous generate_forecast_times: one tier_for call per slot."""
+    start_pac = start.astimezone(PACIFIC).replace(
+        minute=0, second=0, microsecond=0
+    ) + timedelta(hours=1)
+    end_pac = start_pac + timedelta(days=days)
+
+    times: list[datetime] = []
+    current = start_pac
+    while current < end_pac:
+        times.append(current.astimezone(UTC))
+        current += TIER_INTERVALS[tier_for(current)]
+    return times
+
+
+def _time(
+    build: Callable[[datetime, int], list[datetime]],
+    starts: list[datetime],
+    repeat: int,
+    before_each: Callable[[datetime], None] | None = None,
+) -> float:
+    """Best-of-`repeat` milliseconds per call of `build` over `starts`."""
+    best = float("inf")
+    for _ in range(repeat):
+        elapsed = 0.0
+        for start in starts:
+            if before_each is not None:
+                before_each(start)
+            began = time.perf_counter()
+            build(start, FORECAST_DAYS)
+            elapsed += time.perf_counter() - began
+        best = min(best, elapsed)
+    return best / len(starts) * 1000
+
+
+def main(n_starts: int, repeat: int) -> None:
+    # Hourly starts spread over a year, so DST changes are included
+    first = datetime(2026, 1, 1, tzinfo=UTC)
+    spacing = timedelta(days=365) / n_starts
+    starts = [first + spacing * i for i in range(n_starts)]
+
+    def clear_caches(_start: datetime) -> None:
+        tiered_grid.cache_clear()
+        _forecast_slots.cache_clear()
+
+    def prime(start: datetime) -> None:
+        forecast_times(start, FORECAST_DAYS)
+
+    loop_ms = _time(loop_forecast_times, starts, repeat)
+    cold_ms = _time(forecast_times, starts, repeat, clear_caches)
+    warm_ms = _time(forecast_times, starts, repeat, prime)
+
+    print(f"{n_starts} starts x {FORECAST_DAYS} days, best of {repeat}")
+    print(f"  loop:      {loop_ms:8.3f} ms/call")
+    print(f"  grid cold: {cold_ms:8.3f} ms/call ({loop_ms / cold_ms:.1f}x)")
+    print(f"  grid warm: {warm_ms:8.3f} ms/call ({loop_ms / warm_ms:.1f}x)")
+
+    differing = 0
+    for start in starts:
+        old = loop_forecast_times(start, FORECAST_DAYS)
+        new = forecast_times(start, FORECAST_DAYS)
+        if old != new:
+            differing += 1
+            print(
+                f"  {start:%Y-%m-%d %H:%M}Z: {len(old)} -> {len(new)} slots, "
+                f"{len(old) - len(set(old))} repeated before, "
+                f"{len(set(new) - set(old))} added"
+            )
+    print(f"{differing} of {n_starts} starts differ (DST weeks only expected)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--starts", type=int, default=52, help="start times spread over a year"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing")
+    args = parser.parse_args()
+    main(args.starts, args.repeat)
@@ -0,0 +1,227 @@
+"""
+Bulk-load parking snapshots from CSV or Parquet exports.
+
+Reads files in chunks, maps lot_name to parking_lots.id from a single lookup,
+COPYs each chunk into a temporary staging table and inserts it into
+parking_snapshots, skipping (lot_id, collected_at) pairs that already exist.
+Accepts the export in docs/parking_analysis and the archives written by
+app.scripts.manage_partitions (columns collected_at, lot_name, free_spaces,
+occupancy_pct and optionally valid_until). Parquet needs pyarrow installed.
+
+Usage:
+    cd backend
+    python -m app.scripts.import_snapshots ../docs/parking_analysis/*.csv
+    python -m app.scripts.import_snapshots archive/*.csv --chunk-size 100000
+"""
+
+import argparse
+import asyncio
+import csv
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, select, text
+
+from app.database import async_session_maker, get_driver_connection
+from app.models import ParkingLot
+from app.services.availability_cache import AVAILABILITY_CHANNEL
+from app.services.cache import notify
+from app.services.partitions import ensure_partitions, month_start
+
+STAGING_TABLE = "snapshot_import"
+STAGING_COLUMNS = [
+    "lot_id",
+    "collected_at",
+    "free_spaces",
+    "occupancy_pct",
+    "valid_until",
+]
+
+Record = tuple[uuid.UUID, datetime, int, Decimal | None, datetime | None]
+
+
+def _read_csv(path: Path, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+    with path.open(newline="", encoding="utf-8") as f:
+        chunk: list[dict[str, Any]] = []
+        for row in csv.DictReader(f):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _read_parquet(path: Path, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise SystemExit("Reading Parquet requires pyarrow: pip install pyarrow") from e
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+def read_chunks(path: Path, chunk_size: int) -> Iterator[list[dict[str, Any]]]:
+    """Yield the rows of a CSV or Parquet file in chunks of `chunk_size`."""
+    if path.suffix.lower() == ".parquet":
+        return _read_parquet(path, chunk_size)
+    return _read_csv(path, chunk_size)
+
+
+def _timestamp(value: Any) -> datetime | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _required_timestamp(value: Any, column: str) -> datetime:
+    moment = _timestamp(value)
+    if moment is None:
+        raise ValueError(f"Row has no {column}")
+    return moment
+
+
+def _decimal(value: Any) -> Decimal | None:
+    if value is None or value == "":
+        return None
+    return Decimal(str(value))
+
+
+def to_records(
+    rows: list[dict[str, Any]], lot_ids: dict[str, uuid.UUID], unknown: set[str]
+) -> list[Record]:
+    """Convert file rows to staging records; rows for unknown lots are dropped."""
+    records: list[Record] = []
+    for row in rows:
+        lot_id = lot_ids.get(row["lot_name"])
+        if lot_id is None:
+            unknown.add(row["lot_name"])
+            continue
+        records.append(
+            (
+                lot_id,
+                _required_timestamp(row["collected_at"], "collected_at"),
+                int(row["free_spaces"]),
+                _decimal(row.get("occupancy_pct")),
+                _timestamp(row.get("valid_until")),
+            )
+        )
+    return records
+
+
+async def main(paths: list[Path], chunk_size: int) -> None:
+    started = time.perf_counter()
+    rows_read = rows_imported = 0
+    unknown: set[str] = set()
+    ensured_months: set[datetime] = set()
+    touched_lots: set[uuid.UUID] = set()
+
+    async with async_session_maker() as session:
+        result = await session.execute(select(ParkingLot.name, ParkingLot.id))
+        lot_ids: dict[str, uuid.UUID] = dict(result.tuples().all())
+        print(f"Found {len(lot_ids)} parking lots.")
+
+        for path in paths:
+            print(f"\nImporting {path}")
+            for rows in read_chunks(path, chunk_size):
+                rows_read += len(rows)
+                records = to_records(rows, lot_ids, unknown)
+                if not records:
+                    continue
+
+                # Rows must land in their monthly partition, not the default one
+                months = {month_start(record[1]) for record in records}
+                if not months <= ensured_months:
+                    await ensure_partitions(session, min(months), max(months))
+                    ensured_months |= months
+
+                # Each transaction may get a different pooled connection, so
+                # the staging table lives only as long as the chunk's
+                await session.execute(
+                    text(
+                        f"CREATE TEMP TABLE {STAGING_TABLE} ("
+                        "lot_id UUID, collected_at TIMESTAMPTZ, free_spaces INTEGER, "
+                        "occupancy_pct NUMERIC(5, 2), valid_until TIMESTAMPTZ"
+                        ") ON COMMIT DROP"
+                    )
+                )
+                conn = await get_driver_connection(session)
+                await conn.copy_records_to_table(
+                    STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+                )
+                inserted = await session.execute(
+                    text(
+                        "INSERT INTO parking_snapshots (lot_id, collected_at, "
+                        "free_spaces, occupancy_pct, valid_until) "
+                        "SELECT lot_id, collected_at, free_spaces, occupancy_pct, "
+                        f"valid_until FROM {STAGING_TABLE} "
+                        "ON CONFLICT (lot_id, collected_at) DO NOTHING"
+                    )
+                )
+                await session.commit()
+
+                rows_imported += cast(CursorResult[Any], inserted).rowcount
+                touched_lots.update(record[0] for record in records)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"  {rows_read} rows read, {rows_imported} imported "
+                    f"({rows_read / elapsed:.0f} rows/s)"
+                )
+
+        if touched_lots:
+            # Older archives must not replace newer readings
+            await session.execute(
+                text(
+                    "INSERT INTO lot_latest_availability "
+                    "(lot_id, snapshot_id, snapshot_collected_at, free_spaces, "
+                    "occupancy_pct, collected_at) "
+                    "SELECT s.lot_id, s.id, s.collected_at, s.free_spaces, "
+                    "s.occupancy_pct, coalesce(s.valid_until, s.collected_at) "
+                    "FROM unnest(CAST(:lot_ids AS uuid[])) AS l(lot_id) "
+                    "CROSS JOIN LATERAL (SELECT * FROM parking_snapshots p "
+                    "WHERE p.lot_id = l.lot_id "
+                    "ORDER BY p.collected_at DESC LIMIT 1) s "
+                    "ON CONFLICT (lot_id) DO UPDATE SET "
+                    "snapshot_id = excluded.snapshot_id, "
+                    "snapshot_collected_at = excluded.snapshot_collected_at, "
+                    "free_spaces = excluded.free_spaces, "
+                    "occupancy_pct = excluded.occupancy_pct, "
+                    "collected_at = excluded.collected_at "
+                    "WHERE excluded.collected_at >= "
+                    "lot_latest_availability.collected_at"
+                ),
+                {"lot_ids": list(touched_lots)},
+            )
+            await notify(session, AVAILABILITY_CHANNEL, "import")
+            await session.commit()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"\nImported {rows_imported} of {rows_read} rows in {elapsed:.1f}s "
+        f"({rows_read / elapsed if elapsed else 0:.0f} rows/s); "
+        f"{rows_read - rows_imported} skipped (already stored or unknown lot)."
+    )
+    if unknown:
+        print(f"Unknown lots ({len(unknown)}): {', '.join(sorted(unknown))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="CSV or Parquet files")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="Rows read and copied per transaction (default: 50000)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.paths, args.chunk_size))
@@ -0,0 +1,102 @@
+"""
+Maintain the monthly partitions of parking_snapshots.
+
+Creates partitions ahead of time and optionally detaches old months. Detached
+months can be archived to CSV (in the format app.scripts.import_snapshots
+reads back) and then dropped; --drop is refused without --archive-dir.
+
+Usage:
+    cd backend
+    python -m app.scripts.manage_partitions                    # create 3 months ahead
+    python -m app.scripts.manage_partitions --ahead 6
+    python -m app.scripts.manage_partitions --detach-before 2026-01
+    python -m app.scripts.manage_partitions --detach-before 2026-01 \
+        --archive-dir archive --drop
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.database import async_session_maker, get_driver_connection
+from app.services.partitions import detach_partitions_before, ensure_upcoming_partitions
+
+
+async def main(
+    ahead: int | None,
+    detach_before: datetime | None,
+    archive_dir: Path | None,
+    drop: bool,
+) -> None:
+    async with async_session_maker() as session:
+        created = await ensure_upcoming_partitions(session, ahead)
+        print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+
+        if detach_before is not None:
+            detached = await detach_partitions_before(session, detach_before)
+            print(f"Detached {len(detached)} partitions: {', '.join(detached) or '-'}")
+
+            if archive_dir is not None:
+                archive_dir.mkdir(parents=True, exist_ok=True)
+                conn = await get_driver_connection(session)
+                for name in detached:
+                    path = archive_dir / f"{name}.csv"
+                    await conn.copy_from_query(
+                        "SELECT s.collected_at, l.name AS lot_name, s.free_spaces, "
+                        f's.occupancy_pct, s.valid_until FROM "{name}" s '
+                        "JOIN parking_lots l ON l.id = s.lot_id "
+                        "ORDER BY s.collected_at",
+                        output=str(path),
+                        format="csv",
+                        header=True,
+                    )
+                    print(f"  Archived {name} to {path}")
+
+            if drop:
+                for name in detached:
+                    await session.execute(text(f'DROP TABLE "{name}"'))
+                    print(f"  Dropped {name}")
+
+        await session.commit()
+
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--ahead",
+        type=int,
+        default=None,
+        help=(
+            "Months of partitions to create ahead (default: SNAPSHOT_PARTITIONS_AHEAD)"
+        ),
+    )
+    parser.add_argument(
+        "--detach-before",
+        type=lambda value: datetime.strptime(value, "%Y-%m").replace(tzinfo=UTC),
+        default=None,
+        metavar="YYYY-MM",
+        help="Detach every monthly partition before this month",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=None,
+        help="Write each detached partition to <dir>/<partition>.csv",
+    )
+    parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="Drop detached partitions once archived (needs --archive-dir)",
+    )
+    args = parser.parse_args()
+    if args.detach_before is None and (args.archive_dir is not None or args.drop):
+        parser.error("--archive-dir and --drop only apply with --detach-before")
+    if args.drop and args.archive_dir is None:
+        parser.error("--drop needs --archive-dir, so months are archived first")
+
+    asyncio.run(main(args.ahead, args.detach_before, args.archive_dir, args.drop))
@@ -13,7 +13,7 @@ Usage:
 import asyncio
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert
 
 from app.config import get_settings
@@ -21,6 +21,8 @@ from app.database import async_session_maker
 from app.models.building import Building
 from app.models.lot_building_distance import LotBuildingDistance
 from app.models.parking_lot import ParkingLot
+from app.services.cache import notify
+from app.services.distance_matrix import DISTANCE_CHANNEL
 
 settings = get_settings()
 
@@ -132,10 +134,14 @@ async def main() -> None:
                         set_={
                             "distance_miles": stmt.excluded.distance_miles,
                             "duration_minutes": stmt.excluded.duration_minutes,
+                            # onupdate doesn't apply to upserts; conditional GETs
+                            # on /api/buildings/{id}/lots rely on this advancing
+                            "updated_at": func.now(),
                         },
                     )
                     await session.execute(stmt)
 
+                await notify(session, DISTANCE_CHANNEL)
                 await session.commit()
                 print(f"  {building.nickname}: saved {len(results)} distances")
 
@@ -1,78 +1,88 @@
 from __future__ import annotations
 
-import asyncio
-from functools import lru_cache
+import time
 
+from gotrue.helpers import parse_auth_response, parse_user_response
 from gotrue.types import AuthResponse as GoTrueAuthResponse
-from supabase import Client, create_client
+from gotrue.types import UserResponse as GoTrueUserResponse
+from jose import jwt
 
 from app.config import get_settings
-
-
-@lru_cache
-def get_supabase_client() -> Client:
-    """Get cached Supabase client instance."""
-    settings = get_settings()
-    if not settings.supabase_url or not settings.supabase_anon_key:
-        raise RuntimeError(
-            "SUPABASE_URL and SUPABASE_ANON_KEY must be set for auth operations"
-        )
-    return create_client(settings.supabase_url, settings.supabase_anon_key)
-
-
-@lru_cache
-def get_supabase_admin_client() -> Client:
-    """Get cached Supabase admin client (service role) for user management."""
-    settings = get_settings()
-    if not settings.supabase_url or not settings.supabase_service_role_key:
-        raise RuntimeError(
-            "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set for admin operations"
-        )
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+from app.services.gotrue_client import get_gotrue_client
 
 
 async def delete_user(supabase_id: str) -> None:
     """Delete a user from Supabase Auth."""
-    await asyncio.to_thread(
-        get_supabase_admin_client().auth.admin.delete_user, supabase_id
+    if not get_settings().supabase_service_role_key:
+        raise RuntimeError("SUPABASE_SERVICE_ROLE_KEY must be set for admin operations")
+    await get_gotrue_client().request(
+        "delete_user",
+        "DELETE",
+        f"/admin/users/{supabase_id}",
+        admin=True,
+        json={"should_soft_delete": False},
     )
 
 
+async def get_user(access_token: str) -> GoTrueUserResponse | None:
+    """Ask Supabase Auth for the user an access token belongs to."""
+    data = await get_gotrue_client().request(
+        "get_user", "GET", "/user", access_token=access_token
+    )
+    return parse_user_response(data) if data else None
+
+
 async def sign_up(email: str, password: str) -> GoTrueAuthResponse:
     """Register a new user with Supabase Auth."""
-    return await asyncio.to_thread(
-        get_supabase_client().auth.sign_up, {"email": email, "password": password}
+    data = await get_gotrue_client().request(
+        "sign_up", "POST", "/signup", json={"email": email, "password": password}
     )
+    return parse_auth_response(data)
 
 
 async def sign_in(email: str, password: str) -> GoTrueAuthResponse:
     """Sign in user with email and password."""
-    return await asyncio.to_thread(
-        get_supabase_client().auth.sign_in_with_password,
-        {"email": email, "password": password},
+    data = await get_gotrue_client().request(
+        "sign_in",
+        "POST",
+        "/token",
+        params={"grant_type": "password"},
+        json={"email": email, "password": password},
     )
+    return parse_auth_response(data)
 
 
 async def sign_out(access_token: str) -> None:
     """Sign out user and invalidate session."""
-    client = get_supabase_client()
-    await asyncio.to_thread(client.auth.set_session, access_token, "")
-    await asyncio.to_thread(client.auth.sign_out)
+    await get_gotrue_client().request(
+        "sign_out",
+        "POST",
+        "/logout",
+        access_token=access_token,
+        params={"scope": "global"},
+    )
 
 
 async def refresh_session(refresh_token: str) -> GoTrueAuthResponse:
     """Refresh access token using refresh token."""
-    return await asyncio.to_thread(
-        get_supabase_client().auth.refresh_session, refresh_token
+    data = await get_gotrue_client().request(
+        "refresh_session",
+        "POST",
+        "/token",
+        params={"grant_type": "refresh_token"},
+        json={"refresh_token": refresh_token},
     )
+    return parse_auth_response(data)
 
 
 async def reset_password(email: str, redirect_url: str) -> None:
     """Send a password reset email via Supabase Auth."""
-    await asyncio.to_thread(
-        lambda: get_supabase_client().auth.reset_password_email(
-            email, options={"redirect_to": redirect_url}
-        )
+    await get_gotrue_client().request(
+        "reset_password",
+        "POST",
+        "/recover",
+        params={"redirect_to": redirect_url},
+        json={"email": email},
     )
 
 
@@ -80,6 +90,16 @@ async def update_password(
     access_token: str, refresh_token: str, new_password: str
 ) -> None:
     """Set a new password using reset tokens from the email link."""
-    client = get_supabase_client()
-    await asyncio.to_thread(client.auth.set_session, access_token, refresh_token)
-    await asyncio.to_thread(client.auth.update_user, {"password": new_password})
+    # Reset links can outlive the access token; refresh it like set_session did
+    if jwt.get_unverified_claims(access_token).get("exp", 0) <= time.time():
+        session = (await refresh_session(refresh_token)).session
+        if session is None:
+            raise RuntimeError("Refreshing the reset session returned no session")
+        access_token = session.access_token
+    await get_gotrue_client().request(
+        "update_password",
+        "PUT",
+        "/user",
+        access_token=access_token,
+        json={"password": new_password},
+    )
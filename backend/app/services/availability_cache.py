@@ -0,0 +1,170 @@
+"""
+In-process cache of parking lots with their latest availability.
+
+Availability only changes when the collector stores a reading, so each API
+worker keeps one copy of the lot list instead of querying it per request. The
+collector sends a NOTIFY on AVAILABILITY_CHANNEL in the transaction that stores
+readings; the invalidation listener drops the cached copy when it arrives.
+AVAILABILITY_CACHE_TTL bounds staleness if a notification is missed.
+"""
+
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import LotLatestAvailability, ParkingLot
+from app.schemas import ParkingLotWithAvailability
+from app.services.cache import ReloadingCache
+from app.services.conditional import etag_for
+
+AVAILABILITY_CHANNEL = "parking_availability"
+
+
+async def load_lots_with_availability(
+    session: AsyncSession,
+) -> list[ParkingLotWithAvailability]:
+    """Load every parking lot with its latest availability, ordered by name."""
+    stmt = (
+        select(
+            ParkingLot,
+            LotLatestAvailability.free_spaces,
+            LotLatestAvailability.occupancy_pct,
+            LotLatestAvailability.collected_at,
+        )
+        .outerjoin(LotLatestAvailability, ParkingLot.id == LotLatestAvailability.lot_id)
+        .order_by(ParkingLot.name)
+    )
+    result = await session.execute(stmt)
+
+    return [
+        ParkingLotWithAvailability(
+            id=lot.id,
+            name=lot.name,
+            address=lot.address,
+            total_spaces=lot.total_spaces,
+            latitude=lot.latitude,
+            longitude=lot.longitude,
+            created_at=lot.created_at,
+            updated_at=lot.updated_at,
+            free_spaces=free_spaces,
+            occupancy_pct=occupancy_pct,
+            availability_updated_at=collected_at,
+        )
+        for lot, free_spaces, occupancy_pct, collected_at in result.all()
+    ]
+
+
+async def load_lots_etag(session: AsyncSession) -> str:
+    """
+    ETag of the lot list, from version markers instead of the list itself.
+
+    Lots change only with a new updated_at, and every collection advances the
+    latest collected_at; the lot ids catch deletions.
+    """
+    result = await session.execute(
+        select(
+            func.array_agg(ParkingLot.id),
+            func.max(ParkingLot.updated_at),
+            func.max(LotLatestAvailability.collected_at),
+        ).outerjoin(
+            LotLatestAvailability, ParkingLot.id == LotLatestAvailability.lot_id
+        )
+    )
+    lot_ids, updated_at, collected_at = result.one()
+    return _lots_etag(lot_ids or [], updated_at, collected_at)
+
+
+def _lots_etag(
+    lot_ids: list[uuid.UUID],
+    updated_at: datetime | None,
+    collected_at: datetime | None,
+) -> str:
+    return etag_for(sorted(lot_ids), updated_at, collected_at)
+
+
+def lot_validators(lot: ParkingLotWithAvailability) -> tuple[str, datetime]:
+    """ETag and Last-Modified for a single lot with its availability."""
+    version = (
+        lot.id,
+        lot.updated_at,
+        lot.free_spaces,
+        lot.occupancy_pct,
+        lot.availability_updated_at,
+    )
+    last_modified = max(filter(None, (lot.updated_at, lot.availability_updated_at)))
+    return etag_for(*version), last_modified
+
+
+class AvailabilityCache(ReloadingCache):
+    """Lots with latest availability, reloaded on invalidation or after `ttl`."""
+
+    def __init__(self, ttl: float) -> None:
+        super().__init__(ttl)
+        self._lots: list[ParkingLotWithAvailability] = []
+        self._by_id: dict[uuid.UUID, ParkingLotWithAvailability] = {}
+        # ETag of the whole lot list, computed once per reload
+        self.etag = _lots_etag([], None, None)
+        self._invalidation_callbacks: list[Callable[[], None]] = []
+
+    async def _load(self, session: AsyncSession) -> None:
+        lots = await load_lots_with_availability(session)
+        self._lots = lots
+        self._by_id = {lot.id: lot for lot in lots}
+        self.etag = _lots_etag(
+            [lot.id for lot in lots],
+            max((lot.updated_at for lot in lots), default=None),
+            max(
+                (
+                    lot.availability_updated_at
+                    for lot in lots
+                    if lot.availability_updated_at
+                ),
+                default=None,
+            ),
+        )
+
+    def _size(self) -> int:
+        return len(self._lots)
+
+    async def get_lots(self, session: AsyncSession) -> list[ParkingLotWithAvailability]:
+        """
+        Return every lot with its latest availability, ordered by name.
+
+        `etag` describes the returned list until the next await.
+        """
+        await self._refresh(session)
+        return self._lots
+
+    async def get_lots_etag(self, session: AsyncSession) -> str:
+        """
+        ETag of the current lot list, without loading the list if it's stale.
+
+        Deleting a lot doesn't advance any timestamp, so the list has no
+        Last-Modified; clients revalidate with the ETag.
+        """
+        if self.ttl > 0 and self._is_fresh():
+            return self.etag
+        return await load_lots_etag(session)
+
+    async def get_lot(
+        self, session: AsyncSession, lot_id: uuid.UUID
+    ) -> ParkingLotWithAvailability | None:
+        """Return a single lot with its latest availability, if it exists."""
+        await self._refresh(session)
+        return self._by_id.get(lot_id)
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        for callback in self._invalidation_callbacks:
+            callback()
+
+    def add_invalidation_callback(self, callback: Callable[[], None]) -> None:
+        """Call `callback` whenever the cached copy is invalidated."""
+        self._invalidation_callbacks.append(callback)
+
+
+availability_cache = AvailabilityCache(get_settings().availability_cache_ttl)
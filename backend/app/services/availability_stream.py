@@ -0,0 +1,122 @@
+"""
+Fan-out of live lot availability to Server-Sent Events subscribers.
+
+One broadcaster per API worker wakes when the availability cache is
+invalidated by the collector's notification, reloads the cache once, and
+pushes the lots whose reading changed to every subscriber as a single
+pre-encoded SSE frame. Subscribers never query the database themselves.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from pydantic import TypeAdapter
+
+from app.database import async_session_maker
+from app.schemas import LotAvailabilityUpdate, ParkingLotWithAvailability
+from app.services.availability_cache import AvailabilityCache, availability_cache
+
+logger = logging.getLogger(__name__)
+
+# Comment frames keep idle connections open through proxies
+HEARTBEAT_SECONDS = 15.0
+HEARTBEAT_FRAME = b": keepalive\n\n"
+
+# Frames buffered per subscriber; a subscriber that falls this far behind is
+# disconnected and resyncs from a full snapshot when its client reconnects
+SUBSCRIBER_BUFFER = 8
+
+_updates_adapter = TypeAdapter(list[LotAvailabilityUpdate])
+
+
+def encode_updates(lots: list[ParkingLotWithAvailability]) -> bytes:
+    """Encode lots as one `availability` SSE frame."""
+    updates = [
+        LotAvailabilityUpdate(
+            lot_id=lot.id,
+            free_spaces=lot.free_spaces,
+            occupancy_pct=lot.occupancy_pct,
+            collected_at=lot.availability_updated_at,
+        )
+        for lot in lots
+    ]
+    return (
+        b"event: availability\ndata: " + _updates_adapter.dump_json(updates) + b"\n\n"
+    )
+
+
+def _reading(lot: ParkingLotWithAvailability) -> tuple:
+    return (lot.free_spaces, lot.occupancy_pct, lot.availability_updated_at)
+
+
+class AvailabilityBroadcaster:
+    """Pushes availability changes from `cache` to subscriber queues."""
+
+    def __init__(self, cache: AvailabilityCache) -> None:
+        self._cache = cache
+        # None tells a subscriber's stream to end
+        self._subscribers: set[asyncio.Queue[bytes | None]] = set()
+        self._last_readings: dict[uuid.UUID, tuple] = {}
+        self._pending = asyncio.Event()
+        cache.add_invalidation_callback(self._pending.set)
+
+    def subscribe(self) -> asyncio.Queue[bytes | None]:
+        """Register a subscriber and return the queue its frames arrive on."""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[bytes | None]) -> None:
+        self._subscribers.discard(queue)
+
+    def _send(self, frame: bytes) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Make room for the end-of-stream marker
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _publish(self) -> None:
+        started = time.perf_counter()
+        async with async_session_maker() as session:
+            lots = await self._cache.get_lots(session)
+
+        changed = [
+            lot for lot in lots if self._last_readings.get(lot.id) != _reading(lot)
+        ]
+        self._last_readings = {lot.id: _reading(lot) for lot in lots}
+        if not changed:
+            return
+
+        self._send(encode_updates(changed))
+        logger.info(
+            "Broadcast %d lot updates to %d subscribers in %.1fms",
+            len(changed),
+            len(self._subscribers),
+            (time.perf_counter() - started) * 1000,
+        )
+
+    async def run(self) -> None:
+        """Publish on every invalidation and send heartbeats; runs until cancelled."""
+        while True:
+            try:
+                await asyncio.wait_for(self._pending.wait(), HEARTBEAT_SECONDS)
+            except TimeoutError:
+                self._send(HEARTBEAT_FRAME)
+                continue
+
+            self._pending.clear()
+            if not self._subscribers:
+                continue
+            try:
+                await self._publish()
+            except Exception:
+                logger.exception("Failed to broadcast availability")
+
+
+availability_broadcaster = AvailabilityBroadcaster(availability_cache)
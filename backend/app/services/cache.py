@@ -0,0 +1,196 @@
+"""
+Per-worker caches of database state, invalidated by Postgres NOTIFY.
+
+Each API worker keeps read-mostly data in memory instead of querying it per
+request. Whatever changes that data sends a NOTIFY on the cache's channel in
+the same transaction, so it is delivered only once the change commits, and
+listen_for_invalidations, run once per worker, calls the matching
+invalidator with the notification's payload. Each cache's TTL bounds
+staleness if a notification is missed.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+import asyncpg
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.schemas import CacheStats
+
+logger = logging.getLogger(__name__)
+
+# Delay before reconnecting a dropped listener connection
+LISTEN_RETRY_SECONDS = 5.0
+
+# Query parameters asyncpg reads from a DSN. Others in DATABASE_URL are meant
+# for SQLAlchemy's dialect, and asyncpg would send them as server settings.
+ASYNCPG_DSN_PARAMS = {
+    "host",
+    "port",
+    "dbname",
+    "database",
+    "user",
+    "password",
+    "passfile",
+    "sslmode",
+    "sslcert",
+    "sslkey",
+    "sslrootcert",
+    "sslcrl",
+    "sslpassword",
+    "ssl_min_protocol_version",
+    "ssl_max_protocol_version",
+    "target_session_attrs",
+}
+SSL_MODES = {"disable", "allow", "prefer", "require", "verify-ca", "verify-full"}
+
+
+async def notify(session: AsyncSession, channel: str, payload: str = "") -> None:
+    """NOTIFY `channel` when the session's transaction commits."""
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+class ReloadingCache:
+    """
+    A copy of database state, reloaded on invalidation or after `ttl`.
+
+    Subclasses implement _load, which replaces the copy, and _size. Concurrent
+    misses share a single reload. A ttl of 0 disables caching: every lookup
+    loads its own copy.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._loaded_at: float | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def _load(self, session: AsyncSession) -> None:
+        raise NotImplementedError
+
+    def _size(self) -> int:
+        raise NotImplementedError
+
+    def _is_fresh(self) -> bool:
+        return time.monotonic() < self._expires_at
+
+    async def _refresh(self, session: AsyncSession) -> None:
+        """Make sure the copy is fresh; callers read it before their next await."""
+        if self.ttl <= 0:
+            # Nothing is reused, so lookups needn't queue behind one load
+            self.misses += 1
+            await self._load(session)
+            self._loaded_at = time.monotonic()
+            return
+        if self._is_fresh():
+            self.hits += 1
+            return
+
+        async with self._lock:
+            # Another lookup may have reloaded while this one waited
+            if self._is_fresh():
+                self.hits += 1
+                return
+
+            self.misses += 1
+            generation = self._generation
+            await self._load(session)
+            self._loaded_at = time.monotonic()
+            # An invalidation during the load may have arrived after the
+            # query's snapshot was taken, so don't trust this copy for long
+            if generation == self._generation:
+                self._expires_at = self._loaded_at + self.ttl
+
+    def invalidate(self) -> None:
+        """Drop the cached copy so the next lookup reloads it."""
+        self._generation += 1
+        self._expires_at = 0.0
+        self.invalidations += 1
+
+    def stats(self) -> CacheStats:
+        """Counters for /health/caches."""
+        lookups = self.hits + self.misses
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            invalidations=self.invalidations,
+            hit_rate=self.hits / lookups if lookups else None,
+            size=self._size(),
+            age_seconds=(
+                time.monotonic() - self._loaded_at
+                if self._loaded_at is not None
+                else None
+            ),
+        )
+
+
+def _listen_dsn() -> str:
+    """asyncpg DSN for the listener connection."""
+    settings = get_settings()
+    url = make_url(settings.database_listen_url or settings.database_url)
+    query = {
+        key: value for key, value in url.query.items() if key in ASYNCPG_DSN_PARAMS
+    }
+    # SQLAlchemy's asyncpg dialect takes the SSL mode as ?ssl=
+    ssl = url.query.get("ssl")
+    if isinstance(ssl, str) and ssl in SSL_MODES:
+        query.setdefault("sslmode", ssl)
+    return url.set(drivername="postgresql", query=query).render_as_string(
+        hide_password=False
+    )
+
+
+async def listen_for_invalidations(
+    invalidators: dict[str, Callable[[str], None]],
+) -> None:
+    """
+    Call each channel's invalidator with the payload of every notification.
+
+    An empty payload means anything on the channel may have changed; it is
+    also what each invalidator receives after the listener (re)connects.
+
+    Runs until cancelled, reconnecting after connection loss. LISTEN needs a
+    session that stays open, so DATABASE_LISTEN_URL should point past any
+    transaction-mode pooler.
+    """
+    dsn = _listen_dsn()
+    while True:
+        try:
+            conn = await asyncpg.connect(dsn, statement_cache_size=0)
+        except (OSError, asyncpg.PostgresError) as e:
+            logger.warning("Invalidation listener failed to connect: %s", e)
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+            continue
+
+        closed = asyncio.Event()
+        try:
+            conn.add_termination_listener(lambda _conn, closed=closed: closed.set())
+            for channel, invalidate in invalidators.items():
+                await conn.add_listener(
+                    channel,
+                    lambda _conn, _pid, _channel, payload, invalidate=invalidate: (
+                        invalidate(payload)
+                    ),
+                )
+            # Anything stored while disconnected was never announced
+            for invalidate in invalidators.values():
+                invalidate("")
+            logger.info("Listening for updates on %s", ", ".join(invalidators))
+            await closed.wait()
+            logger.warning("Invalidation listener connection lost; reconnecting")
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            logger.warning("Invalidation listener failed: %s", e)
+        finally:
+            if not conn.is_closed():
+                await conn.close()
+        await asyncio.sleep(LISTEN_RETRY_SECONDS)
@@ -1,89 +1,405 @@
+import argparse
+import asyncio
 import logging
-from datetime import UTC, datetime
+import signal
+import statistics
+import time
+import uuid
+from collections import deque
+from datetime import UTC, date, datetime
 from decimal import Decimal
+from pathlib import Path
+from typing import Any
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import case, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.database import async_session_maker
-from app.models import ParkingLot, ParkingSnapshot
+from app.database import async_session_maker, engine
+from app.models import LotLatestAvailability, ParkingLot, ParkingSnapshot
+from app.services.availability_cache import AVAILABILITY_CHANNEL
+from app.services.cache import notify
+from app.services.collector_spool import (
+    SpooledCollection,
+    append_collection,
+    claim_spool,
+    read_spool,
+    spool_depth,
+)
+from app.services.nowcast import apply_nowcast
+from app.services.partitions import ensure_upcoming_partitions
+from app.services.timegrid import next_tick, tier_for
 
 logger = logging.getLogger(__name__)
 
+# Number of recent ticks used to compute scheduling jitter
+DRIFT_WINDOW = 288
 
-async def collect_parking_data() -> tuple[int, int]:
+# Spooled collections read and committed together during replay
+SPOOL_REPLAY_BATCH = 100
+
+
+def _occupancy_pct(free_spaces: int, total_spaces: int | None) -> Decimal | None:
+    """Percentage of occupied spaces, or None when capacity is unknown."""
+    if not total_spaces or total_spaces <= 0:
+        return None
+    return Decimal(((total_spaces - free_spaces) / total_spaces) * 100).quantize(
+        Decimal("0.01")
+    )
+
+
+def _readings_by_name(data: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     """
-    Fetch parking data from UCR API and store in database.
-    Returns tuple of (lots_updated, snapshots_created).
+    Key feed entries by lot name.
+
+    The feed can repeat a lot; ON CONFLICT can't touch the same row twice in
+    one statement, so keep the last reading per name.
     """
-    settings = get_settings()
+    readings: dict[str, dict[str, Any]] = {}
+    for lot_data in data:
+        name = lot_data.get("location_name")
+        if name:
+            readings[name] = lot_data
+    return readings
+
+
+def _lot_row(name: str, lot_data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "name": name,
+        "address": lot_data.get("location_address"),
+        "total_spaces": lot_data.get("total_spaces"),
+    }
+
+
+def _snapshot_row(
+    lot_id: uuid.UUID, lot_data: dict[str, Any], collected_at: datetime
+) -> dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "lot_id": lot_id,
+        "free_spaces": lot_data["free_spaces"],
+        "occupancy_pct": _occupancy_pct(
+            lot_data["free_spaces"], lot_data.get("total_spaces")
+        ),
+        "collected_at": collected_at,
+    }
+
 
+async def _upsert_lots(
+    session: AsyncSession, lots: list[dict[str, Any]]
+) -> tuple[dict[str, uuid.UUID], int]:
+    """
+    Insert or update every lot in a single INSERT ... ON CONFLICT statement.
+
+    Returns a name -> id mapping and the number of lots that were created or
+    whose address/capacity changed (their updated_at is bumped to now()).
+    """
+    upsert = pg_insert(ParkingLot).values(lots)
+    changed = or_(
+        ParkingLot.address.is_distinct_from(upsert.excluded.address),
+        ParkingLot.total_spaces.is_distinct_from(upsert.excluded.total_spaces),
+    )
+    stmt = upsert.on_conflict_do_update(
+        index_elements=[ParkingLot.name],
+        set_={
+            "address": upsert.excluded.address,
+            "total_spaces": upsert.excluded.total_spaces,
+            "updated_at": case((changed, func.now()), else_=ParkingLot.updated_at),
+        },
+    ).returning(
+        ParkingLot.id,
+        ParkingLot.name,
+        (ParkingLot.updated_at == func.now()).label("changed"),
+    )
+    result = await session.execute(stmt)
+
+    lot_ids: dict[str, uuid.UUID] = {}
     lots_updated = 0
+    for lot_id, name, was_changed in result.all():
+        lot_ids[name] = lot_id
+        lots_updated += int(bool(was_changed))
+    return lot_ids, lots_updated
+
+
+def _latest_row(
+    row: dict[str, Any], snapshot_id: uuid.UUID, snapshot_collected_at: datetime
+) -> dict[str, Any]:
+    """Build a lot_latest_availability row for a reading stored in a snapshot."""
+    return {
+        "lot_id": row["lot_id"],
+        "snapshot_id": snapshot_id,
+        "snapshot_collected_at": snapshot_collected_at,
+        "free_spaces": row["free_spaces"],
+        "occupancy_pct": row["occupancy_pct"],
+        "collected_at": row["collected_at"],
+    }
+
+
+async def _extend_unchanged_runs(
+    session: AsyncSession, snapshot_rows: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Extend the latest snapshot of every lot whose reading hasn't changed.
+
+    Sets valid_until on those snapshots in one bulk UPDATE. Returns the rows
+    that still need inserting and the latest-availability rows for the
+    extended runs.
+    """
+    result = await session.execute(
+        select(
+            LotLatestAvailability.lot_id,
+            LotLatestAvailability.snapshot_id,
+            LotLatestAvailability.snapshot_collected_at,
+            LotLatestAvailability.free_spaces,
+            LotLatestAvailability.occupancy_pct,
+        ).where(
+            LotLatestAvailability.lot_id.in_([row["lot_id"] for row in snapshot_rows])
+        )
+    )
+    previous = {prev.lot_id: prev for prev in result.all()}
+
+    changed_rows: list[dict[str, Any]] = []
+    extensions: list[dict[str, Any]] = []
+    latest_rows: list[dict[str, Any]] = []
+    for row in snapshot_rows:
+        prev = previous.get(row["lot_id"])
+        if (
+            prev is not None
+            and prev.free_spaces == row["free_spaces"]
+            and prev.occupancy_pct == row["occupancy_pct"]
+        ):
+            extensions.append(
+                {
+                    "id": prev.snapshot_id,
+                    "collected_at": prev.snapshot_collected_at,
+                    "valid_until": row["collected_at"],
+                }
+            )
+            latest_rows.append(
+                _latest_row(row, prev.snapshot_id, prev.snapshot_collected_at)
+            )
+        else:
+            changed_rows.append(row)
+
+    if extensions:
+        await session.execute(update(ParkingSnapshot), extensions)
+    return changed_rows, latest_rows
+
+
+async def _upsert_latest(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Point each lot's latest availability at its newest reading."""
+    stmt = pg_insert(LotLatestAvailability).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LotLatestAvailability.lot_id],
+        set_={
+            "snapshot_id": stmt.excluded.snapshot_id,
+            "snapshot_collected_at": stmt.excluded.snapshot_collected_at,
+            "free_spaces": stmt.excluded.free_spaces,
+            "occupancy_pct": stmt.excluded.occupancy_pct,
+            "collected_at": stmt.excluded.collected_at,
+        },
+        # Never move a lot back to an older reading
+        where=stmt.excluded.collected_at >= LotLatestAvailability.collected_at,
+    )
+    await session.execute(stmt)
+
+
+async def _store_snapshots(
+    session: AsyncSession, snapshot_rows: list[dict[str, Any]], dedup: bool
+) -> tuple[int, dict[str, float]]:
+    """
+    Store one collection's snapshot rows and point latest availability at them.
+
+    With dedup, unchanged readings extend the previous snapshot instead of
+    adding a row. Returns (snapshots_created, phase timings in ms).
+    """
+    timings: dict[str, float] = {}
+
+    latest_rows: list[dict[str, Any]] = []
+    if dedup and snapshot_rows:
+        started = time.perf_counter()
+        snapshot_rows, latest_rows = await _extend_unchanged_runs(
+            session, snapshot_rows
+        )
+        timings["extend_runs"] = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    if snapshot_rows:
+        await session.execute(insert(ParkingSnapshot), snapshot_rows)
+    timings["insert_snapshots"] = (time.perf_counter() - started) * 1000
+
+    latest_rows.extend(
+        _latest_row(row, row["id"], row["collected_at"]) for row in snapshot_rows
+    )
+    started = time.perf_counter()
+    if latest_rows:
+        await _upsert_latest(session, latest_rows)
+    timings["upsert_latest"] = (time.perf_counter() - started) * 1000
+
+    return len(snapshot_rows), timings
+
+
+async def _store_readings(
+    session: AsyncSession,
+    data: list[dict[str, Any]],
+    collected_at: datetime,
+    dedup: bool = False,
+) -> tuple[int, int, dict[str, float]]:
+    """
+    Upsert lots and bulk-insert one snapshot per lot reading.
+
+    Issues a fixed number of statements regardless of how many lots the feed
+    reports, and keeps lot_latest_availability in step in the same
+    transaction. With dedup, unchanged readings extend the previous snapshot
+    instead of adding a row. Returns (lots_updated, snapshots_created, phase
+    timings in ms).
+    """
+    timings: dict[str, float] = {}
+
+    readings = _readings_by_name(data)
+    if not readings:
+        return 0, 0, timings
+
+    started = time.perf_counter()
+    lot_ids, lots_updated = await _upsert_lots(
+        session, [_lot_row(name, lot_data) for name, lot_data in readings.items()]
+    )
+    timings["upsert_lots"] = (time.perf_counter() - started) * 1000
+
+    snapshot_rows = [
+        _snapshot_row(lot_ids[name], lot_data, collected_at)
+        for name, lot_data in readings.items()
+        if lot_data.get("free_spaces") is not None
+    ]
+    snapshots_created, store_timings = await _store_snapshots(
+        session, snapshot_rows, dedup
+    )
+    timings.update(store_timings)
+    if snapshot_rows:
+        await notify(session, AVAILABILITY_CHANNEL, collected_at.isoformat())
+
+    return lots_updated, snapshots_created, timings
+
+
+async def _store_spooled(
+    session: AsyncSession, collections: list[SpooledCollection], dedup: bool
+) -> int:
+    """
+    Store spooled collections in order; returns the number of snapshots added.
+
+    Lots are upserted once for the whole batch, then each collection goes
+    through the same path as a live one, so with dedup unchanged readings
+    extend runs. Readings no newer than their lot's latest stored reading are
+    skipped: either that collection did commit after all or a newer one
+    superseded it, so replaying a batch twice is harmless.
+    """
+    lots: dict[str, dict[str, Any]] = {}
+    batches = []
+    for collected_at, data in sorted(collections, key=lambda c: c[0]):
+        readings = _readings_by_name(data)
+        lots.update(readings)
+        batches.append((collected_at, readings))
+    if not lots:
+        return 0
+
+    lot_ids, _ = await _upsert_lots(
+        session, [_lot_row(name, lot_data) for name, lot_data in lots.items()]
+    )
+    result = await session.execute(
+        select(LotLatestAvailability.lot_id, LotLatestAvailability.collected_at).where(
+            LotLatestAvailability.lot_id.in_(lot_ids.values())
+        )
+    )
+    stored_until: dict[uuid.UUID, datetime] = dict(result.tuples().all())
+
     snapshots_created = 0
+    newest: datetime | None = None
+    for collected_at, readings in batches:
+        snapshot_rows = [
+            _snapshot_row(lot_ids[name], lot_data, collected_at)
+            for name, lot_data in readings.items()
+            if lot_data.get("free_spaces") is not None
+            and (
+                lot_ids[name] not in stored_until
+                or collected_at > stored_until[lot_ids[name]]
+            )
+        ]
+        if not snapshot_rows:
+            continue
+        created, _ = await _store_snapshots(session, snapshot_rows, dedup)
+        snapshots_created += created
+        for row in snapshot_rows:
+            stored_until[row["lot_id"]] = collected_at
+        newest = collected_at
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.ucr_api_url, timeout=60.0)
-            response.raise_for_status()
-            data = response.json()
+    if newest is not None:
+        await notify(session, AVAILABILITY_CHANNEL, newest.isoformat())
+    return snapshots_created
 
-        async with async_session_maker() as session:
-            for lot_data in data:
-                name = lot_data.get("location_name")
-                if not name:
-                    continue
-
-                # Find or create lot
-                stmt = select(ParkingLot).where(ParkingLot.name == name)
-                result = await session.execute(stmt)
-                lot = result.scalar_one_or_none()
-
-                address = lot_data.get("location_address")
-                total_spaces = lot_data.get("total_spaces")
-                free_spaces = lot_data.get("free_spaces")
-
-                if lot is None:
-                    # Create new lot
-                    lot = ParkingLot(
-                        name=name,
-                        address=address,
-                        total_spaces=total_spaces,
-                    )
-                    session.add(lot)
-                    await session.flush()
-                    lots_updated += 1
-                else:
-                    # Update existing lot if needed
-                    if lot.address != address or lot.total_spaces != total_spaces:
-                        lot.address = address
-                        lot.total_spaces = total_spaces
-                        lots_updated += 1
-
-                # Create snapshot if we have free_spaces data
-                if free_spaces is not None:
-                    occupancy_pct = None
-                    if total_spaces and total_spaces > 0:
-                        occupancy_pct = Decimal(
-                            ((total_spaces - free_spaces) / total_spaces) * 100
-                        ).quantize(Decimal("0.01"))
-
-                    snapshot = ParkingSnapshot(
-                        lot_id=lot.id,
-                        free_spaces=free_spaces,
-                        occupancy_pct=occupancy_pct,
-                        collected_at=datetime.now(UTC),
-                    )
-                    session.add(snapshot)
-                    snapshots_created += 1
 
-            await session.commit()
+async def _replay_spool(path: Path, dedup: bool) -> None:
+    """Replay spooled collections in order; failures are logged, not raised."""
+    while (claimed := claim_spool(path)) is not None:
+        collections = 0
+        readings = 0
+        snapshots_created = 0
+        started = time.perf_counter()
+        try:
+            for batch in read_spool(claimed, SPOOL_REPLAY_BATCH):
+                async with async_session_maker() as session:
+                    snapshots_created += await _store_spooled(session, batch, dedup)
+                    await session.commit()
+                collections += len(batch)
+                readings += sum(len(data) for _, data in batch)
+        except Exception as e:
+            logger.error(
+                "Failed to replay spooled collections from %s after %d: %s",
+                claimed,
+                collections,
+                e,
+            )
+            return
 
+        claimed.unlink()
+        elapsed = time.perf_counter() - started
         logger.info(
-            f"Collection complete: {lots_updated} lots updated, "
-            f"{snapshots_created} snapshots created"
+            "Replayed %d spooled collections: %d snapshots created in %.1fms "
+            "(%.0f readings/s), %d collections still spooled",
+            collections,
+            snapshots_created,
+            elapsed * 1000,
+            readings / elapsed if elapsed else 0,
+            spool_depth(path),
         )
 
+
+async def collect_parking_data(
+    client: httpx.AsyncClient | None = None,
+) -> tuple[int, int]:
+    """
+    Fetch parking data from UCR API and store in database.
+    Returns tuple of (lots_updated, snapshots_created).
+
+    Pass a long-lived client to reuse its connections across collections.
+    """
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            return await collect_parking_data(own_client)
+
+    settings = get_settings()
+    spool_path = (
+        Path(settings.collector_spool_path) if settings.collector_spool_path else None
+    )
+
+    try:
+        started = time.perf_counter()
+        response = await client.get(settings.ucr_api_url, timeout=60.0)
+        response.raise_for_status()
+        data = response.json()
+        collected_at = datetime.now(UTC)
+        fetch_ms = (time.perf_counter() - started) * 1000
     except httpx.HTTPError as e:
         logger.error(f"HTTP error fetching parking data: {e}")
         raise
@@ -91,4 +407,140 @@ async def collect_parking_data() -> tuple[int, int]:
         logger.error(f"Error collecting parking data: {e}")
         raise
 
+    # Earlier collections the database missed go in first, oldest first
+    if spool_path is not None:
+        await _replay_spool(spool_path, settings.snapshot_dedup)
+
+    try:
+        async with async_session_maker() as session:
+            lots_updated, snapshots_created, timings = await _store_readings(
+                session, data, collected_at, dedup=settings.snapshot_dedup
+            )
+
+            started = time.perf_counter()
+            await session.commit()
+            timings["commit"] = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        logger.error(f"Error storing parking data: {e}")
+        if spool_path is not None:
+            depth = append_collection(spool_path, collected_at, data)
+            logger.warning(
+                "Spooled collection at %s to %s (%d collections pending replay)",
+                collected_at.isoformat(),
+                spool_path,
+                depth,
+            )
+        raise
+
+    if settings.nowcast_half_life_minutes > 0:
+        await _correct_forecasts(collected_at, settings.nowcast_half_life_minutes)
+
+    logger.info(
+        "Collection complete: %d lots updated, %d snapshots created (fetch=%.1fms %s)",
+        lots_updated,
+        snapshots_created,
+        fetch_ms,
+        " ".join(f"{phase}={ms:.1f}ms" for phase, ms in timings.items()),
+    )
+
     return lots_updated, snapshots_created
+
+
+async def _correct_forecasts(collected_at: datetime, half_life_minutes: float) -> None:
+    """Nowcast upcoming forecasts from a collection; failures are logged, not raised."""
+    try:
+        async with async_session_maker() as session:
+            await apply_nowcast(session, collected_at, half_life_minutes)
+    except Exception:
+        logger.exception("Failed to apply nowcast correction")
+
+
+async def _maintain_partitions() -> None:
+    """Create upcoming snapshot partitions; failures are logged, not raised."""
+    try:
+        async with async_session_maker() as session:
+            await ensure_upcoming_partitions(session)
+            await session.commit()
+    except Exception:
+        logger.exception("Failed to create upcoming snapshot partitions")
+
+
+async def run_daemon() -> None:
+    """
+    Collect forever on the tiered schedule in a single warm process.
+
+    Replaces the per-tier cron services: one HTTP client and the module-level
+    DB pool are reused for every tick, and each tick's drift from its
+    scheduled time is logged along with the jitter over recent ticks. Upcoming
+    snapshot partitions are created once a day.
+    """
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    drifts: deque[float] = deque(maxlen=DRIFT_WINDOW)
+    partitions_checked: date | None = None
+    scheduled = next_tick(datetime.now(UTC))
+    logger.info("Collector daemon started, first tick at %s", scheduled.isoformat())
+
+    async with httpx.AsyncClient() as client:
+        while not stop.is_set():
+            delay = (scheduled - datetime.now(UTC)).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                    break
+                except TimeoutError:
+                    pass
+
+            drift_ms = (datetime.now(UTC) - scheduled).total_seconds() * 1000
+            drifts.append(drift_ms)
+            jitter_ms = statistics.pstdev(drifts) if len(drifts) > 1 else 0.0
+            logger.info(
+                "Tick %s (%s): drift=%+.1fms jitter=%.1fms over %d ticks",
+                scheduled.isoformat(),
+                tier_for(scheduled),
+                drift_ms,
+                jitter_ms,
+                len(drifts),
+            )
+
+            # Keep next months' snapshot partitions in place, once a day
+            if scheduled.date() != partitions_checked:
+                await _maintain_partitions()
+                partitions_checked = scheduled.date()
+
+            try:
+                await collect_parking_data(client)
+            except Exception:
+                # Already logged by collect_parking_data; keep the daemon alive.
+                pass
+
+            following = next_tick(scheduled)
+            now = datetime.now(UTC)
+            if following <= now:
+                logger.warning(
+                    "Collection overran tick %s, resyncing", following.isoformat()
+                )
+                following = next_tick(now)
+            scheduled = following
+
+    await engine.dispose()
+    logger.info("Collector daemon stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect UCR parking data.")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run continuously on the tiered schedule instead of collecting once.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(run_daemon() if args.daemon else collect_parking_data())
@@ -0,0 +1,91 @@
+"""
+Local write-ahead spool for collections the database couldn't store.
+
+Each failed collection is appended as one JSON line holding its collected_at
+and the raw feed payload, and fsynced before the collector gives up on it.
+Replay claims the whole spool by renaming it, so collections spooled while a
+replay is running start a new file, streams the claimed file in batches, and
+deletes it only after all of its readings are committed.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SpooledCollection = tuple[datetime, list[dict[str, Any]]]
+
+
+def _claimed_path(path: Path) -> Path:
+    return path.with_name(path.name + ".replaying")
+
+
+def append_collection(
+    path: Path, collected_at: datetime, data: list[dict[str, Any]]
+) -> int:
+    """Durably append one collection; returns the number now pending."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps({"collected_at": collected_at.isoformat(), "lots": data})
+    with path.open("a", encoding="utf-8") as f:
+        f.write(line + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return spool_depth(path)
+
+
+def spool_depth(path: Path) -> int:
+    """Number of collections waiting to be replayed."""
+    depth = 0
+    for candidate in (_claimed_path(path), path):
+        if candidate.exists():
+            with candidate.open("rb") as f:
+                depth += sum(1 for line in f if line.strip())
+    return depth
+
+
+def claim_spool(path: Path) -> Path | None:
+    """
+    Return the spool file to replay next, or None if nothing is pending.
+
+    A file left claimed by a failed replay is returned again before newer
+    collections so readings are replayed in order.
+    """
+    claimed = _claimed_path(path)
+    if claimed.exists():
+        return claimed
+    if not path.exists():
+        return None
+    os.replace(path, claimed)
+    return claimed
+
+
+def read_spool(path: Path, batch_size: int) -> Iterator[list[SpooledCollection]]:
+    """
+    Stream spooled collections in batches of up to `batch_size`.
+
+    The file is read line by line, so only one batch is held in memory. Lines
+    a crash left incomplete are skipped.
+    """
+    batch: list[SpooledCollection] = []
+    with path.open(encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                batch.append(
+                    (datetime.fromisoformat(entry["collected_at"]), entry["lots"])
+                )
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Skipping unreadable spool line %s:%d", path, number)
+                continue
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
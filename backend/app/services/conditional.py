@@ -0,0 +1,66 @@
+"""
+Conditional GET support: ETag / Last-Modified validators and 304 responses.
+
+Endpoints derive a validator from cheap version markers (latest collected_at,
+forecast generated_at, updated_at columns) before running their full query,
+so a client whose copy is current gets a 304 without the query or response
+serialization.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+
+def etag_for(*markers: object) -> str:
+    """Strong ETag for a response fully determined by `markers`."""
+    digest = hashlib.blake2b(repr(markers).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def _is_current(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence; GET uses weak comparison
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            return False
+        # HTTP dates have whole-second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime | None = None,
+) -> Response | None:
+    """
+    Attach validators and check the request's preconditions.
+
+    Returns a 304 response to send instead if the client's copy is current;
+    otherwise sets the validators on `response` and returns None. Only pass
+    `last_modified` when the response can't change without it advancing.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(UTC), usegmt=True
+        )
+
+    if _is_current(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
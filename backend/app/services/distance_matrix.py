@@ -0,0 +1,105 @@
+"""
+In-process lot × building walking distance matrix.
+
+Walking distances only change when app.scripts.populate_distances runs, so
+each API worker keeps them as dense NumPy arrays (building × lot) together
+with every building's lots presorted by distance, and the classroom and
+building endpoints rank lots from memory. Building rows themselves are still
+read per request, so new and edited buildings show up at once.
+populate_distances sends a NOTIFY on DISTANCE_CHANNEL in the transaction that
+stores new distances; the invalidation listener drops the cached copy when it
+arrives. DISTANCE_CACHE_TTL bounds staleness if a notification is missed.
+"""
+
+import uuid
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import LotBuildingDistance
+from app.services.cache import ReloadingCache
+
+DISTANCE_CHANNEL = "lot_building_distances"
+
+# (lot id, distance in miles, walking minutes), closest first
+NearestLots = list[tuple[uuid.UUID, float, float]]
+
+
+class DistanceMatrix(ReloadingCache):
+    """Lot distances per building, reloaded on invalidation or after `ttl`."""
+
+    def __init__(self, ttl: float) -> None:
+        super().__init__(ttl)
+        self._building_index: dict[uuid.UUID, int] = {}
+        self._lot_ids: list[uuid.UUID] = []
+        # building × lot; NaN where no distance is stored
+        self._miles = np.empty((0, 0))
+        self._minutes = np.empty((0, 0))
+        # Per building, indexes of lots with a distance, closest first
+        self._orderings: list[np.ndarray] = []
+        # Newest distance row, for validators
+        self.updated_at: datetime | None = None
+
+    async def _load(self, session: AsyncSession) -> None:
+        rows = (
+            await session.execute(
+                select(
+                    LotBuildingDistance.building_id,
+                    LotBuildingDistance.lot_id,
+                    LotBuildingDistance.distance_miles,
+                    LotBuildingDistance.duration_minutes,
+                    LotBuildingDistance.updated_at,
+                )
+            )
+        ).all()
+
+        building_ids = sorted({row.building_id for row in rows})
+        building_index = {building_id: i for i, building_id in enumerate(building_ids)}
+        lot_ids = sorted({row.lot_id for row in rows})
+        lot_index = {lot_id: i for i, lot_id in enumerate(lot_ids)}
+
+        miles = np.full((len(building_ids), len(lot_ids)), np.nan)
+        minutes = np.full_like(miles, np.nan)
+        if rows:
+            b = np.array([building_index[row.building_id] for row in rows])
+            lot = np.array([lot_index[row.lot_id] for row in rows])
+            miles[b, lot] = [float(row.distance_miles) for row in rows]
+            minutes[b, lot] = [float(row.duration_minutes) for row in rows]
+
+        # NaN sorts last, so each row's known distances form a prefix
+        order = np.argsort(miles, axis=1, kind="stable")
+        known = np.count_nonzero(~np.isnan(miles), axis=1)
+
+        self._building_index = building_index
+        self._lot_ids = lot_ids
+        self._miles = miles
+        self._minutes = minutes
+        self._orderings = [order[i, : known[i]] for i in range(len(building_ids))]
+        self.updated_at = max((row.updated_at for row in rows), default=None)
+
+    def _size(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self._miles)))
+
+    async def nearest_lots(
+        self, session: AsyncSession, building_id: uuid.UUID
+    ) -> NearestLots:
+        """Lots with a stored distance to `building_id`, closest first."""
+        await self._refresh(session)
+        row = self._building_index.get(building_id)
+        if row is None:
+            return []
+        ordering = self._orderings[row]
+        return list(
+            zip(
+                [self._lot_ids[i] for i in ordering],
+                self._miles[row, ordering].tolist(),
+                self._minutes[row, ordering].tolist(),
+                strict=True,
+            )
+        )
+
+
+distance_matrix = DistanceMatrix(get_settings().distance_cache_ttl)
@@ -0,0 +1,243 @@
+"""
+In-process cache of the active forecasts as per-lot sorted arrays.
+
+Planning queries ask what each lot will look like at one instant, so each API
+worker keeps every lot's forecast series as NumPy arrays sorted by time and
+answers with a binary search plus linear interpolation between the two
+surrounding slots, instead of sending whole series to the client. Batch chart
+requests sample several lots' series on one shared time axis from the same
+arrays. The forecast job and the collector's nowcast send a NOTIFY on
+FORECAST_CHANNEL when they change the active forecasts; the invalidation
+listener drops the cached copy when it arrives. FORECAST_CACHE_TTL bounds
+staleness if a notification is missed.
+"""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import ParkingForecast, ParkingLot
+from app.schemas import (
+    ForecastAtTime,
+    ForecastSeriesResponse,
+    LotForecastSeries,
+)
+from app.services.cache import ReloadingCache
+from app.services.forecast_generations import active_generation
+from app.services.nowcast import MAX_SLOT_AGE
+
+# Forecast times (UTC, milliseconds), predicted free spaces, lower bounds and
+# lot capacity, all sorted by time
+LotSeries = tuple[np.ndarray, np.ndarray, np.ndarray, int | None]
+
+TIME_UNIT = "datetime64[ms]"
+
+
+async def load_forecast_series(session: AsyncSession) -> dict[uuid.UUID, LotSeries]:
+    """
+    Load the active generation's forecasts as sorted arrays per lot.
+
+    Keeps the slot before now so the current moment can be interpolated.
+    """
+    stmt = (
+        select(
+            ParkingForecast.lot_id,
+            ParkingForecast.forecast_time,
+            ParkingForecast.predicted_free_spaces,
+            ParkingForecast.predicted_free_spaces_lower,
+            ParkingLot.total_spaces,
+        )
+        .join(ParkingLot, ParkingLot.id == ParkingForecast.lot_id)
+        .where(
+            ParkingForecast.generation_id == active_generation().scalar_subquery(),
+            ParkingForecast.forecast_time >= func.now() - MAX_SLOT_AGE,
+        )
+        .order_by(ParkingForecast.lot_id, ParkingForecast.forecast_time)
+    )
+    result = await session.execute(stmt)
+    df = pd.DataFrame(
+        result.all(), columns=["lot_id", "time", "free", "lower", "capacity"]
+    )
+    if df.empty:
+        return {}
+
+    times = pd.to_datetime(df["time"], utc=True).dt.tz_localize(None)
+    df["time"] = times.to_numpy(TIME_UNIT)
+    series = {}
+    for lot_id, group in df.groupby("lot_id", sort=False):
+        capacity = group["capacity"].iat[0]
+        series[lot_id] = (
+            group["time"].to_numpy(TIME_UNIT),
+            group["free"].to_numpy(np.float64),
+            group["lower"].to_numpy(np.float64),
+            None if pd.isna(capacity) else int(capacity),
+        )
+    return series
+
+
+def interpolate(series: LotSeries, at: np.datetime64) -> tuple[float, float] | None:
+    """
+    Free spaces and lower bound at `at`, linear between the surrounding slots.
+
+    Returns None outside the forecast horizon.
+    """
+    times, free, lower, _capacity = series
+    after = int(np.searchsorted(times, at, side="right"))
+    if after == 0:
+        return None
+    before = after - 1
+    if times[before] == at:
+        return float(free[before]), float(lower[before])
+    if after == len(times):
+        return None
+
+    weight = (at - times[before]) / (times[after] - times[before])
+    return (
+        float(free[before] + weight * (free[after] - free[before])),
+        float(lower[before] + weight * (lower[after] - lower[before])),
+    )
+
+
+def sample(series: LotSeries, grid: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Free spaces and lower bounds at each time in `grid`, interpolated linearly.
+
+    Times outside the lot's forecasts are NaN.
+    """
+    times, free, lower, _capacity = series
+    x = times.astype(np.int64)
+    at = grid.astype(np.int64)
+    return (
+        np.interp(at, x, free, left=np.nan, right=np.nan),
+        np.interp(at, x, lower, left=np.nan, right=np.nan),
+    )
+
+
+def _instant(moment: datetime) -> np.datetime64:
+    """`moment` as a UTC datetime64; naive times are taken as UTC."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC).replace(tzinfo=None)
+    return np.datetime64(moment, "ms")
+
+
+def _rounded(values: np.ndarray) -> list[float | None]:
+    return [None if np.isnan(v) else v for v in values.round(1).tolist()]
+
+
+class ForecastCache(ReloadingCache):
+    """Active forecast series per lot, reloaded on invalidation or after `ttl`."""
+
+    def __init__(self, ttl: float) -> None:
+        super().__init__(ttl)
+        self._series: dict[uuid.UUID, LotSeries] = {}
+
+    async def _load(self, session: AsyncSession) -> None:
+        self._series = await load_forecast_series(session)
+
+    def _size(self) -> int:
+        return len(self._series)
+
+    async def forecasts_at(
+        self,
+        session: AsyncSession,
+        at: datetime,
+        lot_ids: list[uuid.UUID] | None = None,
+    ) -> list[ForecastAtTime]:
+        """
+        Interpolated forecasts for `lot_ids` (default every lot) at `at`.
+
+        Naive times are taken as UTC. Lots without forecasts on both sides of
+        `at` are left out.
+        """
+        await self._refresh(session)
+        series = self._series
+        instant = _instant(at)
+
+        forecasts = []
+        for lot_id in series if lot_ids is None else lot_ids:
+            lot_series = series.get(lot_id)
+            if lot_series is None:
+                continue
+            values = interpolate(lot_series, instant)
+            if values is None:
+                continue
+            free, lower = values
+            capacity = lot_series[3]
+            forecasts.append(
+                ForecastAtTime(
+                    lot_id=lot_id,
+                    predicted_free_spaces=round(free, 1),
+                    predicted_free_spaces_lower=round(lower, 1),
+                    predicted_occupancy_pct=(
+                        round((capacity - free) / capacity * 100, 2)
+                        if capacity
+                        else None
+                    ),
+                )
+            )
+        return forecasts
+
+    async def series_between(
+        self,
+        session: AsyncSession,
+        start: datetime,
+        end: datetime | None = None,
+        step: timedelta | None = None,
+        lot_ids: list[uuid.UUID] | None = None,
+    ) -> ForecastSeriesResponse:
+        """
+        Forecast series for `lot_ids` (default every lot) on one shared time axis.
+
+        The axis runs from `start` to `end` (default the end of the forecasts)
+        at whole multiples of `step`, or through every forecast slot in that
+        range without one. The range is clamped to the selected lots'
+        forecasts, so the axis never outgrows the forecast horizon. Values are
+        interpolated linearly between slots.
+        """
+        await self._refresh(session)
+        series = self._series
+        selected = [
+            (lot_id, series[lot_id])
+            for lot_id in (series if lot_ids is None else lot_ids)
+            if lot_id in series
+        ]
+        if not selected:
+            return ForecastSeriesResponse(times=[], series=[])
+
+        lot_times = [values[0] for _, values in selected]
+        earliest = min(t[0] for t in lot_times)
+        latest = max(t[-1] for t in lot_times)
+        # Outside the forecasts every value would be NaN
+        first = max(_instant(start), earliest)
+        last = min(_instant(end), latest) if end is not None else latest
+        if first > last:
+            grid = np.array([], dtype=TIME_UNIT)
+        elif step is not None:
+            # Align to whole steps so repeated requests share an axis
+            interval = np.timedelta64(step, "ms")
+            first += -(first - np.datetime64(0, "ms")) % interval
+            grid = np.arange(first, last + 1, interval)
+        else:
+            slots = np.unique(np.concatenate(lot_times))
+            grid = slots[(slots >= first) & (slots <= last)]
+
+        lot_series = []
+        for lot_id, values in selected:
+            free, lower = sample(values, grid)
+            lot_series.append(
+                LotForecastSeries(
+                    lot_id=lot_id,
+                    predicted_free_spaces=_rounded(free),
+                    predicted_free_spaces_lower=_rounded(lower),
+                )
+            )
+        times = [t.replace(tzinfo=UTC) for t in grid.astype(datetime).tolist()]
+        return ForecastSeriesResponse(times=times, series=lot_series)
+
+
+forecast_cache = ForecastCache(get_settings().forecast_cache_ttl)
@@ -0,0 +1,151 @@
+"""
+Forecast generations: write a complete forecast set, then swap it in at once.
+
+The forecast job writes every lot's rows under a new, inactive generation and
+activates it by setting activated_at in a single statement. Readers resolve the
+active generation once and read only its rows, so they never see a lot between
+runs or a mix of two runs. Older generations are then deleted in bulk.
+Activation notifies FORECAST_CHANNEL so API workers reload cached forecasts.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Select, delete, exists, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ForecastGeneration, ParkingForecast
+from app.services.cache import notify
+
+FORECAST_CHANNEL = "parking_forecasts"
+
+# Columns copied when a lot's forecasts carry over to a new generation
+_CARRIED_COLUMNS = [
+    ParkingForecast.lot_id,
+    ParkingForecast.forecast_time,
+    ParkingForecast.predicted_free_spaces,
+    ParkingForecast.predicted_free_spaces_lower,
+    ParkingForecast.predicted_occupancy_pct,
+    ParkingForecast.model_version,
+    ParkingForecast.generated_at,
+    ParkingForecast.baseline_free_spaces,
+    ParkingForecast.baseline_free_spaces_lower,
+    ParkingForecast.nowcast_at,
+]
+
+
+def active_generation() -> Select:
+    """Select the id of the generation readers should see, if any."""
+    return (
+        select(ForecastGeneration.id)
+        .where(ForecastGeneration.activated_at.is_not(None))
+        .order_by(ForecastGeneration.activated_at.desc())
+        .limit(1)
+    )
+
+
+async def start_generation(
+    session: AsyncSession, model_version: str, generated_at: datetime
+) -> uuid.UUID:
+    """Create an inactive generation and commit; returns its id."""
+    generation = ForecastGeneration(
+        model_version=model_version, generated_at=generated_at
+    )
+    session.add(generation)
+    await session.commit()
+    return generation.id
+
+
+async def _carry_over(
+    session: AsyncSession, previous_id: uuid.UUID, generation_id: uuid.UUID
+) -> int:
+    """Copy future forecasts of lots the new generation has no rows for."""
+    new = ParkingForecast.__table__.alias("new")
+    rows = select(
+        *_CARRIED_COLUMNS,
+        literal(generation_id, ParkingForecast.generation_id.type),
+    ).where(
+        ParkingForecast.generation_id == previous_id,
+        ParkingForecast.forecast_time >= func.now(),
+        ~exists().where(
+            new.c.generation_id == generation_id,
+            new.c.lot_id == ParkingForecast.lot_id,
+        ),
+    )
+    # Without defaults, each copied row gets its own id from the server default
+    result = await session.execute(
+        insert(ParkingForecast).from_select(
+            [column.key for column in _CARRIED_COLUMNS] + ["generation_id"],
+            rows,
+            include_defaults=False,
+        )
+    )
+    return result.rowcount
+
+
+async def activate_generation(session: AsyncSession, generation_id: uuid.UUID) -> int:
+    """
+    Make `generation_id` the active generation and commit.
+
+    Lots that failed or were skipped this run keep their remaining forecasts
+    from the previous generation. Returns the number of rows carried over.
+    """
+    previous_id = await session.scalar(active_generation())
+    carried = 0
+    if previous_id is not None:
+        carried = await _carry_over(session, previous_id, generation_id)
+
+    in_generation = ParkingForecast.generation_id == generation_id
+    await session.execute(
+        update(ForecastGeneration)
+        .where(ForecastGeneration.id == generation_id)
+        .values(
+            activated_at=func.now(),
+            lot_count=select(func.count(ParkingForecast.lot_id.distinct()))
+            .where(in_generation)
+            .scalar_subquery(),
+            row_count=select(func.count())
+            .select_from(ParkingForecast)
+            .where(in_generation)
+            .scalar_subquery(),
+        )
+    )
+    await notify(session, FORECAST_CHANNEL)
+    await session.commit()
+    return carried
+
+
+async def drop_old_generations(session: AsyncSession, generation_id: uuid.UUID) -> int:
+    """
+    Delete generations older than `generation_id` and their forecasts, and commit.
+
+    Includes runs that never activated. Returns the number of forecast rows
+    deleted.
+    """
+    generated_at = await session.scalar(
+        select(ForecastGeneration.generated_at).where(
+            ForecastGeneration.id == generation_id
+        )
+    )
+    # Leave alone a newer run that may still be writing
+    is_old = (
+        ForecastGeneration.id != generation_id,
+        ForecastGeneration.generated_at <= generated_at,
+    )
+    result = await session.execute(
+        delete(ParkingForecast).where(
+            ParkingForecast.generation_id.in_(
+                select(ForecastGeneration.id).where(*is_old)
+            )
+        )
+    )
+    await session.execute(delete(ForecastGeneration).where(*is_old))
+    await session.commit()
+    return result.rowcount
+
+
+async def clear_forecasts(session: AsyncSession) -> None:
+    """Delete every generation and forecast, and commit."""
+    await session.execute(delete(ParkingForecast))
+    await session.execute(delete(ForecastGeneration))
+    await session.commit()
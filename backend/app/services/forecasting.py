@@ -10,84 +10,120 @@ as the data collectors:
 Run daily as a cron job — see render.yaml.
 """
 
+import asyncio
 import logging
-from datetime import UTC, datetime, timedelta
-from decimal import Decimal
-from zoneinfo import ZoneInfo
+import multiprocessing
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
 
 import numpy as np
 import pandas as pd
-from prophet import Prophet
-from sqlalchemy import delete, exists, func, insert, or_, select
-
-from app.database import async_session_maker
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    DateTime,
+    cast,
+    exists,
+    func,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session_maker, get_driver_connection
 from app.models import AcademicWeek, ParkingForecast, ParkingLot, ParkingSnapshot
+from app.services import seasonal_profile
+from app.services.forecast_generations import (
+    activate_generation,
+    clear_forecasts,
+    drop_old_generations,
+    start_generation,
+)
+from app.services.model_store import (
+    load_model,
+    model_path,
+    save_model,
+    warm_start_params,
+)
+from app.services.snapshots import expanded_snapshots, snapshot_as_of
+from app.services.timegrid import PACIFIC, forecast_times
 
 logger = logging.getLogger(__name__)
 
-PACIFIC = ZoneInfo("America/Los_Angeles")
+# How the model store supplied a lot's Prophet model ("reused", "warm" or
+# "cold") and the training seconds that saved compared with a cold fit
+StoreOutcome = tuple[str, float]
+# A lot handed to its engine: the lot, engine name, capacity and submit time
+Submission = tuple[ParkingLot, str, int, float]
+
 MODEL_VERSION = "prophet-v1"
 FORECAST_DAYS = 7
 MIN_SNAPSHOTS = 50
-
-
-def generate_forecast_times(start: datetime, days: int = FORECAST_DAYS) -> list[datetime]:
-    """
-    Build a list of future timeslots in UTC matching the 3-tiered collection schedule.
-
-    All time-of-day logic is done in Pacific time (handles DST correctly),
-    then each slot is converted to UTC for storage.
-    """
-    # Start from the next full hour in Pacific time
-    start_pac = start.astimezone(PACIFIC).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-    end_pac = start_pac + timedelta(days=days)
-
-    times: list[datetime] = []
-    current = start_pac
-
-    while current < end_pac:
-        hour = current.hour
-        weekday = current.weekday()  # 0=Mon, 6=Sun
-        is_weekday = weekday < 5
-
-        if is_weekday and 6 <= hour < 11:
-            # Rush: every 5 minutes
-            slot_end_hour = 11
-            while current.hour < slot_end_hour and current < end_pac:
-                times.append(current.astimezone(UTC))
-                current += timedelta(minutes=5)
-        elif is_weekday and 11 <= hour < 18:
-            # Midday: every 15 minutes
-            slot_end_hour = 18
-            while current.hour < slot_end_hour and current < end_pac:
-                times.append(current.astimezone(UTC))
-                current += timedelta(minutes=15)
-        else:
-            # Off-peak: every 60 minutes (nights + weekends)
-            times.append(current.astimezone(UTC))
-            current += timedelta(minutes=60)
-
-    return times
-
-
-def _train_and_predict(
+# Rows fetched per round trip while streaming snapshot history
+HISTORY_CHUNK_ROWS = 50_000
+# A stored Prophet model is reused without refitting until the lot has this
+# share of new history (and at least MIN_SNAPSHOTS new rows)
+RETRAIN_NEW_FRACTION = 0.05
+# Columns written by COPY; id takes its server default
+FORECAST_COLUMNS = [
+    "lot_id",
+    "forecast_time",
+    "predicted_free_spaces",
+    "predicted_free_spaces_lower",
+    "predicted_occupancy_pct",
+    "model_version",
+    "generated_at",
+    "generation_id",
+]
+
+
+def _train_lot(
+    engine: str,
     history_df: pd.DataFrame,
     future_times: list[datetime],
     capacity: int,
-) -> pd.DataFrame:
+    model_file: str | None = None,
+) -> tuple[pd.DataFrame, float, float, StoreOutcome | None]:
     """
-    Train a Prophet model on historical snapshots and predict future free_spaces.
+    Process-pool entry point around the engine's train-and-predict function.
 
-    Uses logistic growth capped at the lot's capacity. Returns a DataFrame with
-    columns: forecast_time, predicted_free, predicted_free_lower (all clamped
-    to [0, capacity]).
+    Returns the forecast with the wall-clock start and end of training, so the
+    caller can tell queue wait apart from training time. With a `model_file`,
+    Prophet goes through the model store and its outcome is returned too.
     """
+    started = time.time()
+    outcome = None
+    if engine == "prophet" and model_file is not None:
+        forecast_df, outcome = _train_and_predict_stored(
+            history_df, future_times, capacity, Path(model_file)
+        )
+    else:
+        forecast_df = ENGINES[engine](history_df, future_times, capacity)
+    return forecast_df, started, time.time(), outcome
+
+
+def _prophet_history(history_df: pd.DataFrame, capacity: int) -> pd.DataFrame:
+    """Snapshot history as Prophet training data (ds, y, cap, floor)."""
     prophet_df = history_df[["collected_at", "free_spaces"]].rename(
         columns={"collected_at": "ds", "free_spaces": "y"}
     )
     prophet_df["ds"] = pd.to_datetime(prophet_df["ds"]).dt.tz_localize(None)
     prophet_df["cap"] = capacity
     prophet_df["floor"] = 0
+    return prophet_df
+
+
+def _fit_prophet(prophet_df: pd.DataFrame, init: dict[str, Any] | None = None) -> Any:
+    """Fit a Prophet model, optionally starting from another model's parameters."""
+    # Imported here so runs that only use the profile engine never load
+    # Prophet and cmdstan
+    from prophet import Prophet
 
     model = Prophet(
         yearly_seasonality=False,
@@ -97,8 +133,14 @@ def _train_and_predict(
         changepoint_prior_scale=0.1,
         seasonality_prior_scale=5,
     )
-    model.fit(prophet_df)
+    model.fit(prophet_df, init=init)
+    return model
+
 
+def _predict_prophet(
+    model: Any, future_times: list[datetime], capacity: int
+) -> pd.DataFrame:
+    """Predict future free_spaces with a fitted Prophet model."""
     future = pd.DataFrame({"ds": [t.replace(tzinfo=None) for t in future_times]})
     future["cap"] = capacity
     future["floor"] = 0
@@ -115,16 +157,234 @@ def _train_and_predict(
     return result
 
 
+def _train_and_predict(
+    history_df: pd.DataFrame,
+    future_times: list[datetime],
+    capacity: int,
+) -> pd.DataFrame:
+    """
+    Train a Prophet model on historical snapshots and predict future free_spaces.
+
+    Uses logistic growth capped at the lot's capacity. Returns a DataFrame with
+    columns: forecast_time, predicted_free, predicted_free_lower (all clamped
+    to [0, capacity]).
+    """
+    model = _fit_prophet(_prophet_history(history_df, capacity))
+    return _predict_prophet(model, future_times, capacity)
+
+
+def _train_and_predict_stored(
+    history_df: pd.DataFrame,
+    future_times: list[datetime],
+    capacity: int,
+    path: Path,
+) -> tuple[pd.DataFrame, StoreOutcome]:
+    """
+    _train_and_predict backed by the lot's model in the model store.
+
+    The stored model is reused as is while the lot has little new history
+    since it was fitted, refitted from its parameters once it has more, and
+    replaced by a fit from scratch if it is missing, was fitted for another
+    capacity or can't be warm-started.
+    """
+    prophet_df = _prophet_history(history_df, capacity)
+    stored = load_model(path)
+    model = None
+    cold_fit_seconds = 0.0
+    if stored is not None and stored[1]["capacity"] == capacity:
+        previous, metadata = stored
+        cold_fit_seconds = metadata["cold_fit_seconds"]
+        trained_until = pd.Timestamp(metadata["trained_until"])
+        new_rows = int((prophet_df["ds"] > trained_until).sum())
+        if new_rows < max(MIN_SNAPSHOTS, RETRAIN_NEW_FRACTION * metadata["rows"]):
+            forecast_df = _predict_prophet(previous, future_times, capacity)
+            return forecast_df, ("reused", cold_fit_seconds)
+
+        started = time.perf_counter()
+        try:
+            model = _fit_prophet(prophet_df, init=warm_start_params(previous))
+            status = "warm"
+        except Exception:
+            # e.g. the refit placed a different number of changepoints
+            model = None
+
+    if model is None:
+        started = time.perf_counter()
+        model = _fit_prophet(prophet_df)
+        status = "cold"
+        cold_fit_seconds = time.perf_counter() - started
+    fit_seconds = time.perf_counter() - started
+
+    save_model(
+        path,
+        model,
+        {
+            "capacity": capacity,
+            "trained_until": prophet_df["ds"].max().isoformat(),
+            "rows": len(prophet_df),
+            "cold_fit_seconds": cold_fit_seconds,
+            "fitted_at": datetime.now(UTC).isoformat(),
+        },
+    )
+    forecast_df = _predict_prophet(model, future_times, capacity)
+    return forecast_df, (status, max(cold_fit_seconds - fit_seconds, 0.0))
+
+
+# Forecast engines by name, with the model_version stored on their forecasts
+ENGINES = {
+    "prophet": _train_and_predict,
+    "profile": seasonal_profile.train_and_predict,
+}
+ENGINE_VERSIONS = {
+    "prophet": MODEL_VERSION,
+    "profile": seasonal_profile.MODEL_VERSION,
+}
+
+
+async def stream_histories(
+    session: AsyncSession, term_weeks_only: bool, until: datetime | None = None
+) -> AsyncIterator[tuple[uuid.UUID, np.ndarray, np.ndarray]]:
+    """
+    Stream every lot's snapshot history from a single query.
+
+    Runs of unchanged readings are expanded, and with `term_weeks_only` points
+    are kept only inside academic weeks (Sunday 00:00 through Saturday 24:00
+    Pacific), filtered in SQL. Runs that touch no academic week, or that start
+    at or after `until`, are skipped before they are expanded. Rows arrive
+    ordered by lot and are decoded chunk by chunk, so the stream holds one
+    lot's history at a time; callers decide how many yielded histories to
+    keep. Yields (lot_id, collected_at as naive UTC datetime64[us],
+    free_spaces as int32).
+    """
+    week_start = func.timezone(PACIFIC.key, cast(AcademicWeek.start_date, DateTime))
+    week_end = func.timezone(PACIFIC.key, cast(AcademicWeek.end_date + 1, DateTime))
+    runs: list[ColumnElement[bool]] = []
+    if term_weeks_only:
+        runs.append(
+            exists(
+                select(AcademicWeek.id).where(
+                    week_start <= snapshot_as_of(),
+                    week_end > ParkingSnapshot.collected_at,
+                )
+            )
+        )
+
+    expanded = expanded_snapshots(*runs, end=until).subquery()
+    stmt = select(
+        expanded.c.lot_id,
+        cast(func.extract("epoch", expanded.c.collected_at) * 1_000_000, BigInteger),
+        expanded.c.free_spaces,
+    ).order_by(expanded.c.lot_id, expanded.c.collected_at)
+    if term_weeks_only:
+        # A semi-join, so overlapping weeks don't repeat a point
+        stmt = stmt.where(
+            exists(
+                select(AcademicWeek.id).where(
+                    expanded.c.collected_at >= week_start,
+                    expanded.c.collected_at < week_end,
+                )
+            )
+        )
+
+    result = await session.stream(
+        stmt.execution_options(yield_per=HISTORY_CHUNK_ROWS)
+    )
+    current: uuid.UUID | None = None
+    times_parts: list[np.ndarray] = []
+    free_parts: list[np.ndarray] = []
+    async for chunk in result.partitions():
+        lot_ids = [row[0] for row in chunk]
+        times = np.fromiter((row[1] for row in chunk), np.int64, len(chunk))
+        free = np.fromiter((row[2] for row in chunk), np.int32, len(chunk))
+
+        # Split the chunk where the lot changes
+        start = 0
+        for end in range(1, len(chunk) + 1):
+            if end < len(chunk) and lot_ids[end] == lot_ids[start]:
+                continue
+            if lot_ids[start] != current:
+                if current is not None:
+                    yield (
+                        current,
+                        np.concatenate(times_parts).view("datetime64[us]"),
+                        np.concatenate(free_parts),
+                    )
+                current, times_parts, free_parts = lot_ids[start], [], []
+            times_parts.append(times[start:end])
+            free_parts.append(free[start:end])
+            start = end
+
+    if current is not None:
+        yield (
+            current,
+            np.concatenate(times_parts).view("datetime64[us]"),
+            np.concatenate(free_parts),
+        )
+
+
+async def _store_forecasts(
+    session: AsyncSession,
+    lot: ParkingLot,
+    forecast_df: pd.DataFrame,
+    capacity: int,
+    now: datetime,
+    generation_id: uuid.UUID,
+    model_version: str,
+) -> int:
+    """Write a lot's forecasts into a generation and commit; returns the row count."""
+    # Build each column in one pass; COPY needs plain Python values
+    predicted = forecast_df["predicted_free"].to_numpy(np.int64)
+    predicted_lower = forecast_df["predicted_free_lower"].to_numpy(np.int64)
+    if capacity > 0:
+        occupancy_pct = np.round((capacity - predicted) / capacity * 100, 2).tolist()
+    else:
+        occupancy_pct = [None] * len(predicted)
+    slot_times = (
+        pd.to_datetime(forecast_df["forecast_time"]).dt.tz_localize(UTC).dt.to_pydatetime()
+    )
+    records = [
+        (lot.id, ft, pf, pl, pct, model_version, now, generation_id)
+        for ft, pf, pl, pct in zip(
+            slot_times, predicted.tolist(), predicted_lower.tolist(), occupancy_pct
+        )
+    ]
+
+    conn = await get_driver_connection(session)
+    await conn.copy_records_to_table(
+        ParkingForecast.__tablename__, records=records, columns=FORECAST_COLUMNS
+    )
+
+    # Commit per lot to keep transactions short; the rows stay invisible to
+    # readers until the generation is activated
+    await session.commit()
+    return len(records)
+
+
 async def generate_forecasts() -> int:
     """
     Main entry point for the forecast cron job.
 
-    For each lot with enough history, trains Prophet and stores 7-day forecasts.
+    For each lot with enough history, trains its forecast engine (FORECAST_ENGINE,
+    or the lot's entry in FORECAST_ENGINE_OVERRIDES) and stores 7-day forecasts.
+    Prophet lots are trained in parallel on FORECAST_WORKERS processes; profile
+    lots take milliseconds and run inline. With FORECAST_MODEL_DIR set, Prophet
+    models are kept between runs and only refitted once a lot has enough new
+    history. The run's forecasts replace the previous run's all at once when
+    it finishes.
     Returns the total number of forecast rows inserted.
     """
+    settings = get_settings()
+    unknown = {settings.forecast_engine, *settings.forecast_engine_overrides.values()}
+    unknown -= ENGINES.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown forecast engine(s) {sorted(unknown)}; "
+            f"expected one of {sorted(ENGINES)}"
+        )
+
     total_inserted = 0
     now = datetime.now(UTC)
-    future_times = generate_forecast_times(now)
+    future_times = forecast_times(now, FORECAST_DAYS)
 
     logger.info(
         "Starting forecast generation: %d timeslots over %d days",
@@ -137,7 +397,7 @@ async def generate_forecasts() -> int:
         has_weeks_result = await session.execute(
             select(exists(select(AcademicWeek.id)))
         )
-        has_weeks = has_weeks_result.scalar()
+        has_weeks = bool(has_weeks_result.scalar())
 
         # Break detection: if terms are configured but today is not in any week,
         # we're on a break — clear forecasts and exit early.
@@ -155,97 +415,198 @@ async def generate_forecasts() -> int:
             )
             if not in_term_result.scalar():
                 logger.info("Break detected — deleting all forecasts")
-                await session.execute(delete(ParkingForecast))
-                await session.commit()
+                await clear_forecasts(session)
                 return 0
 
         # Fetch all lots with their capacity
         lots_result = await session.execute(select(ParkingLot))
         lots = lots_result.scalars().all()
 
-        # Pre-compute UTC timestamp ranges from academic weeks so we can filter
-        # snapshots with index-friendly range predicates instead of per-row casts.
-        term_utc_ranges: list[tuple[datetime, datetime]] = []
-        if has_weeks:
-            weeks_result = await session.execute(
-                select(AcademicWeek.start_date, AcademicWeek.end_date)
-            )
-            for w_start, w_end in weeks_result.all():
-                # Convert week date boundaries to UTC timestamps.
-                # A week starts at Sunday 00:00 Pacific and ends at Saturday 23:59:59 Pacific.
-                utc_start = datetime(w_start.year, w_start.month, w_start.day, tzinfo=PACIFIC).astimezone(UTC)
-                utc_end = datetime(w_end.year, w_end.month, w_end.day, 23, 59, 59, tzinfo=PACIFIC).astimezone(UTC)
-                term_utc_ranges.append((utc_start, utc_end))
-
-        for lot in lots:
-            # Load snapshots, filtered to academic weeks when available
-            snap_stmt = (
-                select(ParkingSnapshot.collected_at, ParkingSnapshot.free_spaces)
-                .where(ParkingSnapshot.lot_id == lot.id)
-                .order_by(ParkingSnapshot.collected_at)
+        # Readers keep seeing the active generation until this one is complete
+        generation_id = await start_generation(
+            session, ENGINE_VERSIONS[settings.forecast_engine], now
+        )
+
+        # Prophet fitting is CPU-bound, so it runs in worker processes while
+        # reads and writes stay on this event loop. Spawned workers don't
+        # inherit the parent's event loop or DB connections.
+        workers = settings.forecast_workers or os.cpu_count() or 1
+        loop = asyncio.get_running_loop()
+        training_seconds = 0.0
+        # Wall-clock span of the fits, from the first start to the last finish
+        fit_started: float | None = None
+        fit_finished: float | None = None
+        write_seconds = 0.0
+        trained_lots = 0
+        model_dir = (
+            Path(settings.forecast_model_dir) if settings.forecast_model_dir else None
+        )
+        store_outcomes: dict[str, int] = {"reused": 0, "warm": 0, "cold": 0}
+        store_saved_seconds = 0.0
+
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            # Submit each lot as soon as its history is loaded, but keep at
+            # most max_in_flight histories queued for or inside the workers so
+            # memory stays bounded however many lots there are. Results are
+            # small and are written once the history stream is done with the
+            # session.
+            max_in_flight = 2 * workers
+            lots_by_id = {lot.id: lot for lot in lots}
+            history_counts: dict[uuid.UUID, int] = {}
+            pending: dict[asyncio.Future, Submission] = {}
+            completed: list[tuple[asyncio.Future, Submission]] = []
+
+            async def wait_for_training(limit: int) -> None:
+                while len(pending) > limit:
+                    done, _ = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    completed.extend((future, pending.pop(future)) for future in done)
+
+            load_started = time.perf_counter()
+            async for lot_id, times, free in stream_histories(session, has_weeks, now):
+                history_counts[lot_id] = len(times)
+                lot = lots_by_id.get(lot_id)
+                if lot is None or len(times) < MIN_SNAPSHOTS:
+                    continue
+
+                capacity = lot.total_spaces or int(free.max())
+                history_df = pd.DataFrame({"collected_at": times, "free_spaces": free})
+                engine = settings.forecast_engine_overrides.get(
+                    lot.name, settings.forecast_engine
+                )
+                submitted = time.time()
+                if engine == "prophet":
+                    model_file = (
+                        str(model_path(model_dir, MODEL_VERSION, lot.id))
+                        if model_dir is not None
+                        else None
+                    )
+                    await wait_for_training(max_in_flight - 1)
+                    future = loop.run_in_executor(
+                        pool,
+                        _train_lot,
+                        engine,
+                        history_df,
+                        future_times,
+                        capacity,
+                        model_file,
+                    )
+                else:
+                    # Cheaper to run here than to ship the history to a worker
+                    future = loop.create_future()
+                    try:
+                        future.set_result(
+                            _train_lot(engine, history_df, future_times, capacity)
+                        )
+                    except Exception as e:
+                        future.set_exception(e)
+                    completed.append((future, (lot, engine, capacity, submitted)))
+                    continue
+                pending[future] = (lot, engine, capacity, submitted)
+
+            load_seconds = time.perf_counter() - load_started
+            loaded_rows = sum(history_counts.values())
+            logger.info(
+                "Loaded %d snapshots for %d lots in %.2fs (%.0f rows/s)",
+                loaded_rows,
+                len(history_counts),
+                load_seconds,
+                loaded_rows / load_seconds if load_seconds else 0,
             )
-            if term_utc_ranges:
-                snap_stmt = snap_stmt.where(
-                    or_(*(
-                        ParkingSnapshot.collected_at.between(utc_start, utc_end)
-                        for utc_start, utc_end in term_utc_ranges
-                    ))
+            for lot in lots:
+                if history_counts.get(lot.id, 0) < MIN_SNAPSHOTS:
+                    logger.info(
+                        "Skipping %s: only %d snapshots (need %d)",
+                        lot.name,
+                        history_counts.get(lot.id, 0),
+                        MIN_SNAPSHOTS,
+                    )
+
+            # Store forecasts in completion order
+            await wait_for_training(0)
+            for future, (lot, engine, capacity, submitted) in completed:
+                try:
+                    forecast_df, started, finished, outcome = future.result()
+                except Exception:
+                    logger.exception(
+                        "Engine %s failed for lot %s, skipping", engine, lot.name
+                    )
+                    continue
+
+                trained_lots += 1
+                training_seconds += finished - started
+                fit_started = min(started, fit_started or started)
+                fit_finished = max(finished, fit_finished or finished)
+                if outcome is not None:
+                    store_outcomes[outcome[0]] += 1
+                    store_saved_seconds += outcome[1]
+                write_started = time.perf_counter()
+                inserted = await _store_forecasts(
+                    session,
+                    lot,
+                    forecast_df,
+                    capacity,
+                    now,
+                    generation_id,
+                    ENGINE_VERSIONS[engine],
                 )
-            snap_result = await session.execute(snap_stmt)
-            rows = snap_result.all()
+                written = time.perf_counter() - write_started
+                write_seconds += written
+                total_inserted += inserted
 
-            if len(rows) < MIN_SNAPSHOTS:
                 logger.info(
-                    "Skipping %s: only %d snapshots (need %d)",
+                    "Generated %d %s forecasts for %s%s "
+                    "(train=%.3fs queue=%.1fs write=%.3fs)",
+                    inserted,
+                    engine,
                     lot.name,
-                    len(rows),
-                    MIN_SNAPSHOTS,
+                    f" [{outcome[0]} model]" if outcome is not None else "",
+                    finished - started,
+                    started - submitted,
+                    written,
                 )
-                continue
-
-            capacity = lot.total_spaces or max(r.free_spaces for r in rows)
-            history_df = pd.DataFrame(rows, columns=["collected_at", "free_spaces"])
 
-            try:
-                forecast_df = _train_and_predict(history_df, future_times, capacity)
-            except Exception:
-                logger.exception("Prophet failed for lot %s, skipping", lot.name)
-                continue
-
-            # Delete old forecasts for this lot
-            await session.execute(
-                delete(ParkingForecast).where(ParkingForecast.lot_id == lot.id)
+        if trained_lots:
+            elapsed = (fit_finished or 0.0) - (fit_started or 0.0)
+            logger.info(
+                "Fitted %d lots over %.1fs on %d workers "
+                "(%.1fs of training, %.1fx speedup over serial)",
+                trained_lots,
+                elapsed,
+                workers,
+                training_seconds,
+                training_seconds / elapsed if elapsed else 1.0,
+            )
+            logger.info(
+                "Wrote %d forecast rows in %.2fs (%.0f rows/s)",
+                total_inserted,
+                write_seconds,
+                total_inserted / write_seconds if write_seconds else 0,
+            )
+        stored_lots = sum(store_outcomes.values())
+        if stored_lots:
+            logger.info(
+                "Model store: %d reused, %d warm-started, %d fitted from scratch "
+                "(%.0f%% hit rate, ~%.1fs of training saved)",
+                store_outcomes["reused"],
+                store_outcomes["warm"],
+                store_outcomes["cold"],
+                store_outcomes["reused"] / stored_lots * 100,
+                store_saved_seconds,
             )
 
-            # Build rows for bulk insert
-            forecast_rows = []
-            for ft, pf, pl in zip(
-                forecast_df["forecast_time"],
-                forecast_df["predicted_free"],
-                forecast_df["predicted_free_lower"],
-            ):
-                pf_int = int(pf)
-                occupancy_pct = (
-                    Decimal(str(round((capacity - pf_int) / capacity * 100, 2)))
-                    if capacity > 0 else None
-                )
-                forecast_rows.append({
-                    "lot_id": lot.id,
-                    "forecast_time": ft.to_pydatetime().replace(tzinfo=UTC),
-                    "predicted_free_spaces": pf_int,
-                    "predicted_free_spaces_lower": int(pl),
-                    "predicted_occupancy_pct": occupancy_pct,
-                    "model_version": MODEL_VERSION,
-                    "generated_at": now,
-                })
-
-            await session.execute(insert(ParkingForecast), forecast_rows)
-            total_inserted += len(forecast_rows)
-
-            # Commit per lot so a failure on one lot doesn't lose another's forecasts
-            await session.commit()
-
-            logger.info("Generated %d forecasts for %s", len(forecast_rows), lot.name)
+        carried = await activate_generation(session, generation_id)
+        dropped = await drop_old_generations(session, generation_id)
+        logger.info(
+            "Activated forecast generation %s (%d rows carried over from lots "
+            "not forecast this run, %d old rows dropped)",
+            generation_id,
+            carried,
+            dropped,
+        )
 
     logger.info("Forecast generation complete: %d total rows inserted", total_inserted)
     return total_inserted
@@ -0,0 +1,156 @@
+"""
+Async client for the Supabase Auth (GoTrue) REST API.
+
+All auth calls from an API worker share one httpx.AsyncClient, so
+connections to Supabase stay open (HTTP/2, keep-alive) instead of each call
+taking a default-executor thread for a synchronous request. At most
+SUPABASE_AUTH_MAX_CONCURRENCY calls are in flight; the rest wait their turn
+rather than piling up connections during login storms. Each operation's call
+count, errors and latency are kept for /health/auth.
+
+Responses are parsed into the same gotrue types, and errors raised as the
+same AuthError subclasses, as the synchronous supabase client.
+"""
+
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any
+
+import httpx
+from gotrue.helpers import handle_exception
+
+from app.config import get_settings
+from app.schemas import AuthClientStats, UpstreamStats
+
+AUTH_PATH = "/auth/v1"
+
+
+class _Timings:
+    """Call count, errors and latency of one operation."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def record(self, seconds: float, failed: bool) -> None:
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def stats(self) -> UpstreamStats:
+        return UpstreamStats(
+            calls=self.calls,
+            errors=self.errors,
+            mean_ms=self.total_seconds / self.calls * 1000 if self.calls else None,
+            max_ms=self.max_seconds * 1000,
+        )
+
+
+class GoTrueClient:
+    """Pooled async GoTrue client with bounded concurrency."""
+
+    def __init__(
+        self,
+        url: str,
+        anon_key: str,
+        service_role_key: str,
+        max_concurrency: int,
+        timeout: float,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.anon_key = anon_key
+        self.service_role_key = service_role_key
+        self._http = httpx.AsyncClient(
+            base_url=url.rstrip("/") + AUTH_PATH,
+            http2=True,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            transport=transport,
+        )
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._timings: dict[str, _Timings] = {}
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def request(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        *,
+        access_token: str | None = None,
+        admin: bool = False,
+        json: dict[str, Any] | None = None,
+        params: dict[str, str] | None = None,
+    ) -> Any:
+        """
+        Call a GoTrue endpoint and return its JSON body (None if empty).
+
+        Requests carry the anon key, or the service role key if `admin`, and
+        are authorized as `access_token`'s user when given.
+        """
+        key = self.service_role_key if admin else self.anon_key
+        headers = {"apikey": key, "Authorization": f"Bearer {access_token or key}"}
+
+        self.waiting += 1
+        async with self._slots:
+            self.waiting -= 1
+            self.in_flight += 1
+            started = time.perf_counter()
+            failed = True
+            try:
+                response = await self._http.request(
+                    method, path, headers=headers, json=json, params=params
+                )
+                response.raise_for_status()
+                failed = False
+            except httpx.HTTPError as e:
+                raise handle_exception(e) from e
+            finally:
+                self.in_flight -= 1
+                timings = self._timings.setdefault(operation, _Timings())
+                timings.record(time.perf_counter() - started, failed)
+
+        return response.json() if response.content else None
+
+    def stats(self) -> AuthClientStats:
+        """Counters for /health/auth."""
+        return AuthClientStats(
+            in_flight=self.in_flight,
+            waiting=self.waiting,
+            operations={op: t.stats() for op, t in sorted(self._timings.items())},
+        )
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+@lru_cache
+def get_gotrue_client() -> GoTrueClient:
+    """Get the cached GoTrue client configured from settings."""
+    settings = get_settings()
+    if not settings.supabase_url or not settings.supabase_anon_key:
+        raise RuntimeError(
+            "SUPABASE_URL and SUPABASE_ANON_KEY must be set for auth operations"
+        )
+    return GoTrueClient(
+        url=settings.supabase_url,
+        anon_key=settings.supabase_anon_key,
+        service_role_key=settings.supabase_service_role_key,
+        max_concurrency=settings.supabase_auth_max_concurrency,
+        timeout=settings.supabase_auth_timeout,
+    )
+
+
+async def close_gotrue_client() -> None:
+    """Close the shared client's connections if it was ever created."""
+    if get_gotrue_client.cache_info().currsize:
+        await get_gotrue_client().aclose()
+        get_gotrue_client.cache_clear()
@@ -0,0 +1,60 @@
+"""
+Local store of fitted Prophet models, keyed by model_version and lot.
+
+Each entry is one JSON file holding the serialized model (Prophet's
+model_to_json) and metadata about the history it was fitted on, so the next
+forecast run can reuse the model or warm-start a refit from its parameters.
+Files are replaced atomically, so a crash never leaves a half-written model.
+"""
+
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def model_path(store_dir: Path, model_version: str, lot_id: uuid.UUID) -> Path:
+    """File holding the model for `lot_id` under `model_version`."""
+    return store_dir / model_version / f"{lot_id}.json"
+
+
+def load_model(path: Path) -> tuple[Any, dict[str, Any]] | None:
+    """Return the stored (model, metadata), or None if missing or unreadable."""
+    from prophet.serialize import model_from_json
+
+    if not path.exists():
+        return None
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        return model_from_json(entry["model"]), entry["metadata"]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning("Ignoring unreadable stored model %s: %s", path, e)
+        return None
+
+
+def save_model(path: Path, model: Any, metadata: dict[str, Any]) -> None:
+    """Store a fitted model with its metadata, replacing any previous one."""
+    from prophet.serialize import model_to_json
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".tmp")
+    partial.write_text(
+        json.dumps({"metadata": metadata, "model": model_to_json(model)}),
+        encoding="utf-8",
+    )
+    os.replace(partial, path)
+
+
+def warm_start_params(model: Any) -> dict[str, Any]:
+    """Initial values for Prophet.fit(init=...) from a fitted model's parameters."""
+    return {
+        "k": model.params["k"][0][0],
+        "m": model.params["m"][0][0],
+        "sigma_obs": model.params["sigma_obs"][0][0],
+        "delta": model.params["delta"][0],
+        "beta": model.params["beta"][0],
+    }
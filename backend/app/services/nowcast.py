@@ -0,0 +1,132 @@
+"""
+Intraday nowcast: nudge the next hours of forecasts toward the latest reading.
+
+Forecasts are trained once a day, so by mid-morning they can't see a lot
+filling faster or slower than usual. After each collection, the residual
+between a lot's reading and its forecast for that moment is added to the
+lot's upcoming forecasts, halving every NOWCAST_HALF_LIFE_MINUTES. Corrections
+are always applied to the model's original output (kept in the baseline
+columns), so they replace rather than compound on each other.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.cache import notify
+from app.services.forecast_generations import FORECAST_CHANNEL, active_generation
+from app.services.timegrid import TIER_INTERVALS
+
+logger = logging.getLogger(__name__)
+
+# Corrections stop once they have decayed to 1/16 of the residual
+HALF_LIVES_CORRECTED = 4
+# A reading is compared to the forecast slot at or before it, which is at
+# most one collection interval old
+MAX_SLOT_AGE = max(TIER_INTERVALS.values())
+
+_NOWCAST_SQL = text(
+    """
+    WITH residuals AS (
+        SELECT a.lot_id, a.collected_at,
+               a.free_spaces - coalesce(f.baseline_free_spaces,
+                                        f.predicted_free_spaces) AS residual
+        FROM lot_latest_availability a
+        CROSS JOIN LATERAL (
+            SELECT baseline_free_spaces, predicted_free_spaces
+            FROM parking_forecasts f
+            WHERE f.generation_id = :generation_id
+              AND f.lot_id = a.lot_id
+              AND f.forecast_time <= a.collected_at
+              AND f.forecast_time > a.collected_at - CAST(:max_slot_age AS interval)
+            ORDER BY f.forecast_time DESC
+            LIMIT 1
+        ) f
+        WHERE a.collected_at = :collected_at
+    ),
+    shifted AS (
+        SELECT f.id, l.total_spaces,
+               coalesce(f.baseline_free_spaces, f.predicted_free_spaces) AS baseline,
+               coalesce(f.baseline_free_spaces_lower,
+                        f.predicted_free_spaces_lower) AS baseline_lower,
+               r.residual * power(
+                   0.5,
+                   extract(epoch FROM f.forecast_time - r.collected_at)::float8
+                   / CAST(:half_life_seconds AS float8)
+               ) AS shift
+        FROM residuals r
+        JOIN parking_lots l ON l.id = r.lot_id
+        JOIN parking_forecasts f
+          ON f.generation_id = :generation_id
+         AND f.lot_id = r.lot_id
+         AND f.forecast_time > r.collected_at
+         AND f.forecast_time <= r.collected_at + CAST(:horizon AS interval)
+    ),
+    corrected AS (
+        -- least() ignores a NULL capacity
+        SELECT id, total_spaces, baseline, baseline_lower,
+               greatest(0, least(total_spaces, round(baseline + shift))) AS free,
+               greatest(0, least(total_spaces, round(baseline_lower + shift)))
+                   AS free_lower
+        FROM shifted
+    )
+    UPDATE parking_forecasts f SET
+        baseline_free_spaces = c.baseline,
+        baseline_free_spaces_lower = c.baseline_lower,
+        predicted_free_spaces = c.free,
+        predicted_free_spaces_lower = c.free_lower,
+        predicted_occupancy_pct = CASE
+            WHEN c.total_spaces > 0
+            THEN round((c.total_spaces - c.free)::numeric / c.total_spaces * 100, 2)
+            ELSE f.predicted_occupancy_pct
+        END,
+        nowcast_at = :collected_at
+    FROM corrected c
+    WHERE f.id = c.id
+    """
+)
+
+
+async def apply_nowcast(
+    session: AsyncSession, collected_at: datetime, half_life_minutes: float
+) -> int:
+    """
+    Correct the active forecasts of lots read at `collected_at`, and commit.
+
+    Returns the number of forecast rows updated.
+    """
+    generation_id = await session.scalar(active_generation())
+    if generation_id is None:
+        return 0
+
+    started = time.perf_counter()
+    half_life = timedelta(minutes=half_life_minutes)
+    result = cast(
+        CursorResult[Any],
+        await session.execute(
+            _NOWCAST_SQL,
+            {
+                "generation_id": generation_id,
+                "collected_at": collected_at,
+                "max_slot_age": MAX_SLOT_AGE,
+                "half_life_seconds": half_life.total_seconds(),
+                "horizon": half_life * HALF_LIVES_CORRECTED,
+            },
+        ),
+    )
+    corrected = result.rowcount
+    if corrected:
+        await notify(session, FORECAST_CHANNEL)
+    await session.commit()
+
+    logger.info(
+        "Nowcast corrected %d forecasts in %.1fms (half-life %.0f min)",
+        corrected,
+        (time.perf_counter() - started) * 1000,
+        half_life_minutes,
+    )
+    return corrected
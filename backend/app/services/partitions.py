@@ -0,0 +1,207 @@
+"""
+Monthly range partitions for parking_snapshots.
+
+Each UTC month lives in its own child table named parking_snapshots_pYYYY_MM,
+and parking_snapshots_default catches anything outside the created months.
+Queries bounded by collected_at only scan the matching months. Creating a
+month whose rows already landed in the default partition moves them into the
+new partition.
+"""
+
+import logging
+import re
+from datetime import UTC, datetime
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "parking_snapshots"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant of the UTC month containing `moment`."""
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the child table holding the given month."""
+    return f"{PARENT_TABLE}_p{month:%Y_%m}"
+
+
+async def list_partitions(session: AsyncSession) -> dict[datetime, str]:
+    """Return the attached monthly partitions keyed by month start."""
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions: dict[datetime, str] = {}
+    for (name,) in result.all():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            partitions[datetime(year, month, 1, tzinfo=UTC)] = name
+    return partitions
+
+
+async def _table_exists(session: AsyncSession, name: str) -> bool:
+    result = await session.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f'"{name}"'}
+    )
+    return bool(result.scalar())
+
+
+async def _default_has_rows(
+    session: AsyncSession, month: datetime, next_month: datetime
+) -> bool:
+    result = await session.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE collected_at >= :start AND collected_at < :end)"
+        ),
+        {"start": month, "end": next_month},
+    )
+    return bool(result.scalar())
+
+
+async def _create_partition(
+    session: AsyncSession, name: str, month: datetime, next_month: datetime
+) -> None:
+    # Bounds are generated from datetimes, so inlining them is safe;
+    # DDL doesn't accept bind parameters.
+    await session.execute(
+        text(
+            f'CREATE TABLE "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{next_month.isoformat()}')"
+        )
+    )
+
+
+async def _create_partition_from_default(
+    session: AsyncSession, name: str, month: datetime, next_month: datetime
+) -> int:
+    """
+    Create a month's partition and move its rows out of the default partition.
+
+    Postgres refuses to create a partition while the default holds rows in
+    its range, so the default is detached for the move and attached again
+    afterwards. Returns the number of rows moved.
+    """
+    await session.execute(
+        text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    )
+    await _create_partition(session, name, month, next_month)
+    result = await session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE collected_at >= :start AND collected_at < :end RETURNING *) "
+            f"INSERT INTO {PARENT_TABLE} SELECT * FROM moved"
+        ),
+        {"start": month, "end": next_month},
+    )
+    await session.execute(
+        text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+    return cast(CursorResult[Any], result).rowcount
+
+
+async def ensure_partitions(
+    session: AsyncSession, start: datetime, end: datetime
+) -> list[str]:
+    """
+    Create any missing monthly partitions covering [start, end].
+
+    Rows the default partition already holds for a created month are moved
+    into it. That takes an exclusive lock on parking_snapshots for the move,
+    so it should be rare: it only happens for months written before their
+    partition existed.
+
+    A month detached by detach_partitions_before but not dropped still has its
+    table, so its partition can't be created again. Raises RuntimeError in that
+    case rather than letting the month's rows fall into the default partition:
+    drop or rename the detached table, or attach it again with ALTER TABLE ...
+    ATTACH PARTITION, first.
+    """
+    existing = await list_partitions(session)
+    created: list[str] = []
+
+    month = month_start(start)
+    while month <= end:
+        next_month = add_months(month, 1)
+        if month not in existing:
+            name = partition_name(month)
+            if await _table_exists(session, name):
+                raise RuntimeError(
+                    f"{name} exists but isn't attached to {PARENT_TABLE}; "
+                    "drop, rename or reattach the detached table first"
+                )
+            if await _default_has_rows(session, month, next_month):
+                moved = await _create_partition_from_default(
+                    session, name, month, next_month
+                )
+                logger.warning(
+                    "Moved %d snapshots from %s into new partition %s",
+                    moved,
+                    DEFAULT_PARTITION,
+                    name,
+                )
+            else:
+                await _create_partition(session, name, month, next_month)
+            created.append(name)
+        month = next_month
+
+    if created:
+        logger.info("Created snapshot partitions: %s", ", ".join(created))
+    return created
+
+
+async def ensure_upcoming_partitions(
+    session: AsyncSession, months_ahead: int | None = None
+) -> list[str]:
+    """Create partitions from the current month through `months_ahead` months."""
+    if months_ahead is None:
+        months_ahead = get_settings().snapshot_partitions_ahead
+    now = month_start(datetime.now(UTC))
+    return await ensure_partitions(session, now, add_months(now, months_ahead))
+
+
+async def detach_partitions_before(
+    session: AsyncSession, cutoff: datetime
+) -> list[str]:
+    """
+    Detach every monthly partition that ends on or before `cutoff`'s month.
+
+    Detached partitions become standalone tables that can be archived or
+    dropped without touching the live table.
+    """
+    cutoff_month = month_start(cutoff)
+    detached: list[str] = []
+    for month, name in sorted((await list_partitions(session)).items()):
+        if month >= cutoff_month:
+            break
+        await session.execute(
+            text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"')
+        )
+        detached.append(name)
+
+    if detached:
+        logger.info("Detached snapshot partitions: %s", ", ".join(detached))
+    return detached
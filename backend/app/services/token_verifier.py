@@ -0,0 +1,213 @@
+"""
+Local verification of Supabase access tokens.
+
+Tokens are checked in-process against the project's signing keys instead of
+asking Supabase Auth on every request: signature, expiry and audience are
+verified with python-jose. Asymmetrically signed tokens (RS256/ES256) are
+checked against the project's JWKS, which is fetched once and refreshed every
+SUPABASE_JWKS_REFRESH_SECONDS (or sooner when a token names an unknown key).
+HS256 tokens are checked against SUPABASE_JWT_SECRET. Clients send the same
+token until it expires, so recently verified tokens are remembered until
+their expiry, or until the secret or signing keys change, and repeat requests
+skip the signature check. Tokens that can't be
+checked locally because no matching key is available raise
+UnverifiableTokenError, so callers can fall back to Supabase Auth.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+import httpx
+from jose import JWTError, jwt
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+JWKS_PATH = "/auth/v1/.well-known/jwks.json"
+
+# Algorithms accepted per key source; "none" and mismatched key types are
+# rejected before signature checks
+SECRET_ALGORITHMS = {"HS256"}
+JWKS_ALGORITHMS = {"RS256", "ES256"}
+
+# Minimum seconds between refetches triggered by an unknown key id
+UNKNOWN_KEY_REFETCH_SECONDS = 30.0
+# Seconds to wait for the JWKS endpoint
+JWKS_TIMEOUT_SECONDS = 5.0
+# Verified tokens remembered, least recently used dropped first
+VERIFIED_TOKENS_CACHED = 1024
+
+
+class InvalidTokenError(Exception):
+    """The token is malformed, expired, for another audience or badly signed."""
+
+
+class UnverifiableTokenError(Exception):
+    """No key is available locally to check the token's signature."""
+
+
+class TokenVerifier:
+    """
+    Verifies access tokens against a shared secret and a cached JWKS.
+
+    `jwks_url` may be empty to use the secret only. Keys can also be loaded
+    directly with load_jwks, e.g. from a locally generated key pair.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        secret: str,
+        audience: str,
+        refresh_seconds: float,
+    ) -> None:
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.refresh_seconds = refresh_seconds
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._fetched_at: float | None = None
+        self._lock = asyncio.Lock()
+        # token -> (subject, expiry as a Unix time)
+        self._verified: OrderedDict[str, tuple[uuid.UUID, float]] = OrderedDict()
+        self._secret = secret
+
+    @property
+    def secret(self) -> str:
+        """Shared secret HS256 tokens are checked against."""
+        return self._secret
+
+    @secret.setter
+    def secret(self, secret: str) -> None:
+        if secret != self._secret:
+            # Tokens signed with the old secret must be checked again
+            self._verified.clear()
+        self._secret = secret
+
+    def load_jwks(self, jwks: dict[str, Any]) -> None:
+        """Replace the cached signing keys with those of a JWKS document."""
+        keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+        if keys != self._keys:
+            # Tokens signed by a key that was withdrawn must be checked again
+            self._verified.clear()
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+    def _age(self) -> float | None:
+        if self._fetched_at is None:
+            return None
+        return time.monotonic() - self._fetched_at
+
+    async def refresh(self, min_age: float = 0.0) -> None:
+        """
+        Fetch the JWKS unless it was fetched less than `min_age` seconds ago.
+
+        Failures are logged and the previous keys kept.
+        """
+        if not self.jwks_url:
+            return
+        async with self._lock:
+            age = self._age()
+            if age is not None and age < min_age:
+                return
+            try:
+                async with httpx.AsyncClient(timeout=JWKS_TIMEOUT_SECONDS) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                    self.load_jwks(response.json())
+                logger.info("Loaded %d signing keys from JWKS", len(self._keys))
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                logger.warning("Failed to fetch JWKS from %s: %s", self.jwks_url, e)
+
+    async def run_refresh(self) -> None:
+        """Refresh the JWKS every `refresh_seconds`; runs until cancelled."""
+        if not self.jwks_url:
+            return
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def _key_for(self, header: dict[str, Any]) -> dict[str, Any] | str:
+        algorithm = header.get("alg")
+        if algorithm in SECRET_ALGORITHMS:
+            if not self.secret:
+                raise UnverifiableTokenError("No JWT secret configured")
+            return self.secret
+        if algorithm not in JWKS_ALGORITHMS:
+            raise InvalidTokenError(f"Unsupported token algorithm {algorithm!r}")
+
+        kid = header.get("kid")
+        if not isinstance(kid, str):
+            raise UnverifiableTokenError("Token names no signing key")
+        age = self._age()
+        if kid not in self._keys or age is None or age > self.refresh_seconds:
+            # First use, rotated keys or a stalled background refresh
+            await self.refresh(min_age=UNKNOWN_KEY_REFETCH_SECONDS)
+        key = self._keys.get(kid)
+        if key is None:
+            raise UnverifiableTokenError(f"No signing key with kid {kid!r}")
+        if key.get("alg", algorithm) != algorithm:
+            raise InvalidTokenError("Token algorithm doesn't match its key")
+        return key
+
+    async def verify(self, token: str) -> dict[str, Any]:
+        """Return the token's claims once signature, expiry and audience check out."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from None
+
+        key = await self._key_for(header)
+        try:
+            claims: dict[str, Any] = jwt.decode(
+                token,
+                key,
+                algorithms=[header["alg"]],
+                audience=self.audience,
+                options={"require_exp": True, "require_sub": True},
+            )
+        except JWTError as e:
+            raise InvalidTokenError(str(e)) from None
+        return claims
+
+    async def verify_subject(self, token: str) -> uuid.UUID:
+        """Return the Supabase user id a valid token was issued for."""
+        cached = self._verified.get(token)
+        if cached is not None:
+            subject, expires = cached
+            if time.time() < expires:
+                self._verified.move_to_end(token)
+                return subject
+            del self._verified[token]
+
+        claims = await self.verify(token)
+        try:
+            subject = uuid.UUID(claims["sub"])
+        except (ValueError, TypeError) as e:
+            raise InvalidTokenError(f"Invalid subject: {e}") from None
+
+        self._verified[token] = (subject, float(claims["exp"]))
+        if len(self._verified) > VERIFIED_TOKENS_CACHED:
+            self._verified.popitem(last=False)
+        return subject
+
+
+@lru_cache
+def get_token_verifier() -> TokenVerifier:
+    """Get the cached verifier configured from settings."""
+    settings = get_settings()
+    return TokenVerifier(
+        jwks_url=(
+            settings.supabase_url.rstrip("/") + JWKS_PATH
+            if settings.supabase_url
+            else ""
+        ),
+        secret=settings.supabase_jwt_secret,
+        audience=settings.supabase_jwt_audience,
+        refresh_seconds=settings.supabase_jwks_refresh_seconds,
+    )
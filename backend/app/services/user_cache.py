@@ -0,0 +1,124 @@
+"""
+In-process cache of User rows keyed by Supabase user id.
+
+Every authenticated request resolves its token's subject to a User, so each
+API worker keeps recently seen users for USER_CACHE_TTL seconds instead of
+selecting the row per request. Entries hold column values, not ORM
+instances: a hit builds a fresh User and attaches it to the request's session
+without a query, so no instance is shared between sessions and routes can
+still modify or delete it. Routes that change a user invalidate its entry and
+send a NOTIFY on USER_CHANNEL with its Supabase id, which makes the other
+workers drop that user.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import get_settings
+from app.models import User
+from app.schemas import CacheStats
+
+USER_CHANNEL = "app_users"
+
+_COLUMNS = [attr.key for attr in User.__mapper__.column_attrs]
+
+
+class UserCache:
+    """
+    Up to `max_size` users, each reused for `ttl` seconds.
+
+    Least recently used users are dropped first. A ttl of 0 disables caching.
+    """
+
+    def __init__(self, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        # supabase_id -> (column values, expiry on the monotonic clock)
+        self._users: OrderedDict[uuid.UUID, tuple[dict[str, Any], float]] = (
+            OrderedDict()
+        )
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _lookup(self, supabase_id: uuid.UUID) -> dict[str, Any] | None:
+        entry = self._users.get(supabase_id)
+        if entry is None:
+            return None
+        values, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._users[supabase_id]
+            return None
+        self._users.move_to_end(supabase_id)
+        return values
+
+    def _store(self, user: User) -> None:
+        if self.ttl <= 0:
+            return
+        values = {key: getattr(user, key) for key in _COLUMNS}
+        self._users[user.supabase_id] = (values, time.monotonic() + self.ttl)
+        self._users.move_to_end(user.supabase_id)
+        while len(self._users) > self.max_size:
+            self._users.popitem(last=False)
+
+    async def get_user(
+        self, session: AsyncSession, supabase_id: uuid.UUID
+    ) -> User | None:
+        """Return the user for `supabase_id`, attached to `session`, if it exists."""
+        values = self._lookup(supabase_id)
+        if values is not None:
+            self.hits += 1
+            cached = User(**values)
+            # Treat it as loaded from the database so merge skips the SELECT
+            # and later changes are flushed as an UPDATE of the existing row
+            make_transient_to_detached(cached)
+            return await session.merge(cached, load=False)
+
+        self.misses += 1
+        result = await session.execute(
+            select(User).where(User.supabase_id == supabase_id)
+        )
+        user = result.scalar_one_or_none()
+        if user is not None:
+            self._store(user)
+        return user
+
+    def invalidate(self, supabase_id: uuid.UUID) -> None:
+        """Drop one user so the next request reloads it."""
+        self._users.pop(supabase_id, None)
+        self.invalidations += 1
+
+    def invalidate_notified(self, payload: str) -> None:
+        """Drop the user a USER_CHANNEL payload names, or every user if none."""
+        try:
+            supabase_id = uuid.UUID(payload)
+        except ValueError:
+            self.clear()
+            return
+        self.invalidate(supabase_id)
+
+    def clear(self) -> None:
+        """Drop every user."""
+        self._users.clear()
+        self.invalidations += 1
+
+    def stats(self) -> CacheStats:
+        """Counters for /health/caches."""
+        lookups = self.hits + self.misses
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            invalidations=self.invalidations,
+            hit_rate=self.hits / lookups if lookups else None,
+            size=len(self._users),
+        )
+
+
+user_cache = UserCache(get_settings().user_cache_ttl, get_settings().user_cache_size)
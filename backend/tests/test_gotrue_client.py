@@ -0,0 +1,155 @@
+"""GoTrueClient against a fake Supabase Auth server."""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import httpx
+import pytest
+from gotrue.errors import (
+    AuthApiError,
+    AuthRetryableError,
+    AuthWeakPasswordError,
+)
+
+from app.services.gotrue_client import GoTrueClient
+
+ANON_KEY = "anon-key"
+SERVICE_ROLE_KEY = "service-role-key"
+
+Handler = Callable[[httpx.Request], Coroutine[None, None, httpx.Response]]
+
+
+def client(handler: Handler, max_concurrency: int = 4) -> GoTrueClient:
+    return GoTrueClient(
+        url="https://project.supabase.co/",
+        anon_key=ANON_KEY,
+        service_role_key=SERVICE_ROLE_KEY,
+        max_concurrency=max_concurrency,
+        timeout=5.0,
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def respond(status_code: int, body: Any = None) -> Handler:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, json=body)
+
+    return handler
+
+
+def call(gotrue: GoTrueClient, **kwargs: Any) -> Any:
+    async def run() -> Any:
+        try:
+            return await gotrue.request("token", "POST", "/token", **kwargs)
+        finally:
+            await gotrue.aclose()
+
+    return asyncio.run(run())
+
+
+def test_sends_keys_and_returns_the_json_body() -> None:
+    seen: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"access_token": "issued"})
+
+    gotrue = client(handler)
+    assert call(gotrue, json={"email": "a@b.c"}) == {"access_token": "issued"}
+    request = seen[0]
+    assert request.url == "https://project.supabase.co/auth/v1/token"
+    assert request.headers["apikey"] == ANON_KEY
+    assert request.headers["authorization"] == f"Bearer {ANON_KEY}"
+
+
+def test_admin_calls_use_the_service_role_key_and_user_token() -> None:
+    seen: list[httpx.Request] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(204)
+
+    assert call(client(handler), admin=True, access_token="user-jwt") is None
+    assert seen[0].headers["apikey"] == SERVICE_ROLE_KEY
+    assert seen[0].headers["authorization"] == "Bearer user-jwt"
+
+
+def test_api_errors_keep_their_status_and_code() -> None:
+    gotrue = client(
+        respond(400, {"error_code": "invalid_credentials", "msg": "Invalid login"})
+    )
+    with pytest.raises(AuthApiError) as raised:
+        call(gotrue)
+    assert raised.value.status == 400
+    assert raised.value.code == "invalid_credentials"
+    assert raised.value.message == "Invalid login"
+    assert gotrue.stats().operations["token"].errors == 1
+
+
+def test_weak_passwords_raise_their_own_error() -> None:
+    body = {
+        "error_code": "weak_password",
+        "msg": "Password is too weak",
+        "weak_password": {"reasons": ["length"]},
+    }
+    with pytest.raises(AuthWeakPasswordError) as raised:
+        call(client(respond(422, body)))
+    assert raised.value.reasons == ["length"]
+
+
+@pytest.mark.parametrize("status_code", [502, 503, 504])
+def test_gateway_errors_are_retryable(status_code: int) -> None:
+    with pytest.raises(AuthRetryableError) as raised:
+        call(client(respond(status_code, {"msg": "upstream down"})))
+    assert raised.value.status == status_code
+
+
+def test_connection_failures_are_retryable() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    gotrue = client(handler)
+    with pytest.raises(AuthRetryableError) as raised:
+        call(gotrue)
+    assert raised.value.status == 0
+    assert gotrue.stats().operations["token"].errors == 1
+    assert gotrue.in_flight == 0
+
+
+def test_calls_beyond_the_cap_wait_for_a_slot() -> None:
+    cap = 2
+    release = asyncio.Event()
+    running = 0
+    most_running = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal running, most_running
+        running += 1
+        most_running = max(most_running, running)
+        await release.wait()
+        running -= 1
+        return httpx.Response(200, json={})
+
+    async def run() -> None:
+        gotrue = client(handler, max_concurrency=cap)
+        calls = [
+            asyncio.create_task(gotrue.request("token", "POST", "/token"))
+            for _ in range(5)
+        ]
+        while gotrue.in_flight < cap:
+            await asyncio.sleep(0)
+        # Give the queued calls every chance to get past the cap
+        for _ in range(10):
+            await asyncio.sleep(0)
+        stats = gotrue.stats()
+        assert (stats.in_flight, stats.waiting) == (cap, 3)
+
+        release.set()
+        await asyncio.gather(*calls)
+        await gotrue.aclose()
+        assert (gotrue.in_flight, gotrue.waiting) == (0, 0)
+        assert gotrue.stats().operations["token"].calls == 5
+
+    asyncio.run(run())
+    assert most_running == cap
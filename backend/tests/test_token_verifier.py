@@ -0,0 +1,184 @@
+"""TokenVerifier against locally generated signing keys."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+import rsa
+from ecdsa import NIST256p, SigningKey
+from jose import jwk, jwt
+from jose.utils import base64url_encode
+
+from app.services.token_verifier import (
+    InvalidTokenError,
+    TokenVerifier,
+    UnverifiableTokenError,
+)
+
+SECRET = "test-jwt-secret"
+AUDIENCE = "authenticated"
+SUBJECT = uuid.uuid4()
+
+
+@pytest.fixture(scope="module")
+def rsa_keys() -> tuple[str, str]:
+    public, private = rsa.newkeys(2048)
+    return private.save_pkcs1().decode(), public.save_pkcs1().decode()
+
+
+@pytest.fixture(scope="module")
+def ec_keys() -> tuple[str, str]:
+    private = SigningKey.generate(curve=NIST256p)
+    return private.to_pem().decode(), private.get_verifying_key().to_pem().decode()
+
+
+@pytest.fixture
+def verifier(rsa_keys: tuple[str, str], ec_keys: tuple[str, str]) -> TokenVerifier:
+    verifier = TokenVerifier(
+        jwks_url="", secret=SECRET, audience=AUDIENCE, refresh_seconds=600
+    )
+    verifier.load_jwks(
+        {
+            "keys": [
+                {**jwk.construct(rsa_keys[1], "RS256").to_dict(), "kid": "rsa"},
+                {**jwk.construct(ec_keys[1], "ES256").to_dict(), "kid": "ec"},
+            ]
+        }
+    )
+    return verifier
+
+
+def token(key: str, algorithm: str, kid: str | None = None, **claims: Any) -> str:
+    claims = {
+        "sub": str(SUBJECT),
+        "aud": AUDIENCE,
+        "exp": int(time.time()) + 600,
+        **claims,
+    }
+    headers = {"kid": kid} if kid is not None else None
+    encoded: str = jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+    return encoded
+
+
+def raw_token(header: dict[str, Any], sign: Callable[[bytes], bytes]) -> str:
+    """Assemble a token by hand, for signatures jose refuses to produce."""
+    claims = {"sub": str(SUBJECT), "aud": AUDIENCE, "exp": int(time.time()) + 600}
+    signing_input = b".".join(
+        base64url_encode(json.dumps(part).encode()) for part in (header, claims)
+    )
+    signature: bytes = base64url_encode(sign(signing_input))
+    return (signing_input + b"." + signature).decode()
+
+
+def verify(verifier: TokenVerifier, token: str) -> uuid.UUID:
+    return asyncio.run(verifier.verify_subject(token))
+
+
+def test_accepts_hs256_signed_with_the_secret(verifier: TokenVerifier) -> None:
+    assert verify(verifier, token(SECRET, "HS256")) == SUBJECT
+
+
+def test_accepts_rs256_signed_with_a_jwks_key(
+    verifier: TokenVerifier, rsa_keys: tuple[str, str]
+) -> None:
+    assert verify(verifier, token(rsa_keys[0], "RS256", "rsa")) == SUBJECT
+
+
+def test_accepts_es256_signed_with_a_jwks_key(
+    verifier: TokenVerifier, ec_keys: tuple[str, str]
+) -> None:
+    assert verify(verifier, token(ec_keys[0], "ES256", "ec")) == SUBJECT
+
+
+def test_rejects_expired_tokens(
+    verifier: TokenVerifier, rsa_keys: tuple[str, str]
+) -> None:
+    expired = token(rsa_keys[0], "RS256", "rsa", exp=int(time.time()) - 60)
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, expired)
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, token(SECRET, "HS256", exp=int(time.time()) - 60))
+
+
+def test_rejects_other_audiences(verifier: TokenVerifier) -> None:
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, token(SECRET, "HS256", aud="someone-else"))
+
+
+def test_rejects_a_wrong_secret(verifier: TokenVerifier) -> None:
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, token("not-the-secret", "HS256"))
+
+
+def test_rejects_an_algorithm_that_doesnt_match_the_key(
+    verifier: TokenVerifier, ec_keys: tuple[str, str]
+) -> None:
+    # Signed with the EC key but naming the RSA key
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, token(ec_keys[0], "ES256", "rsa"))
+
+
+def test_rejects_hs256_signed_with_a_public_key(
+    verifier: TokenVerifier, rsa_keys: tuple[str, str]
+) -> None:
+    # HS256 is only ever checked against the secret, never a JWKS key
+    forged = raw_token(
+        {"alg": "HS256", "kid": "rsa"},
+        lambda signing_input: hmac.digest(
+            rsa_keys[1].encode(), signing_input, hashlib.sha256
+        ),
+    )
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, forged)
+
+
+def test_rejects_unsigned_tokens(verifier: TokenVerifier) -> None:
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, raw_token({"alg": "none"}, lambda _signing_input: b""))
+
+
+def test_unknown_keys_are_unverifiable(
+    verifier: TokenVerifier, rsa_keys: tuple[str, str]
+) -> None:
+    with pytest.raises(UnverifiableTokenError):
+        verify(verifier, token(rsa_keys[0], "RS256", "rotated-away"))
+
+
+def test_remembers_verified_tokens(
+    verifier: TokenVerifier, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    valid = token(SECRET, "HS256")
+    assert verify(verifier, valid) == SUBJECT
+
+    async def unreachable(token: str) -> dict[str, Any]:
+        raise AssertionError("a remembered token was verified again")
+
+    monkeypatch.setattr(verifier, "verify", unreachable)
+    # Setting the same secret again keeps what was verified with it
+    verifier.secret = SECRET
+    assert verify(verifier, valid) == SUBJECT
+
+
+def test_forgets_tokens_signed_with_a_rotated_secret(verifier: TokenVerifier) -> None:
+    valid = token(SECRET, "HS256")
+    assert verify(verifier, valid) == SUBJECT
+    verifier.secret = "rotated"
+    with pytest.raises(InvalidTokenError):
+        verify(verifier, valid)
+    assert verify(verifier, token("rotated", "HS256")) == SUBJECT
+
+
+def test_forgets_tokens_signed_with_a_withdrawn_key(
+    verifier: TokenVerifier, rsa_keys: tuple[str, str]
+) -> None:
+    signed = token(rsa_keys[0], "RS256", "rsa")
+    assert verify(verifier, signed) == SUBJECT
+    verifier.load_jwks({"keys": []})
+    with pytest.raises(UnverifiableTokenError):
+        verify(verifier, signed)